@@ -56,16 +56,10 @@ echo [4/5] Installing dependencies...
 echo   This may take a few minutes...
 echo.
 
-REM Core dependencies
+REM Core dependencies - one pip invocation so the resolver runs once
+REM instead of spawning a fresh interpreter per package
 pip install --upgrade pip >nul 2>&1
-pip install PyQt5 >nul 2>&1
-pip install keyring >nul 2>&1
-pip install pyttsx3 >nul 2>&1
-pip install SpeechRecognition >nul 2>&1
-pip install pyaudio >nul 2>&1
-pip install requests >nul 2>&1
-pip install google-generativeai >nul 2>&1
-pip install openai >nul 2>&1
+pip install PyQt5 keyring pyttsx3 SpeechRecognition pyaudio requests google-generativeai openai >nul 2>&1
 
 echo   Dependencies installed!
 
@@ -9,6 +9,7 @@ v2.3: Added multi-task handler for complex commands with dependencies.
 
 import logging
 import re
+import threading
 from typing import Optional, Dict, Any, Tuple
 
 # AURA v2 Components
@@ -82,6 +83,10 @@ class AuraV2Bridge:
             try:
                 self._multi_task_handler = get_multi_task_handler()
                 logging.info("Multi-task handler enabled")
+                # Resolve its lazy imports off the first-command path
+                threading.Thread(
+                    target=self._multi_task_handler.warmup, daemon=True
+                ).start()
             except Exception as e:
                 logging.warning(f"Could not initialize multi-task handler: {e}")
         
@@ -11,14 +11,50 @@ Features:
 
 import os
 import re
+import string
 import webbrowser
 import subprocess
+from collections import defaultdict
+from email.message import EmailMessage
 from pathlib import Path
 from typing import Tuple, Optional
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
 from google import genai
 from config import config
 
+# Resolved once; Path.home() reads the environment on every call.
+_DRAFTS_DIR = Path.home() / "Documents" / "AURA_Drafts"
+
+# Filename sanitization table: keep ASCII alphanumerics, space, dash and
+# underscore; everything else becomes "_". defaultdict-backed so code
+# points >= 128 fall to "_" too (str.translate passes unmapped characters
+# through). Runs in C via str.translate.
+_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + " -_")
+_SANITIZE_TABLE = defaultdict(
+    lambda: "_",
+    {i: (chr(i) if chr(i) in _SAFE_CHARS else "_") for i in range(128)},
+)
+
+# Drafting prompt, built once — draft_email only fills in the blanks.
+_DRAFT_PROMPT_TEMPLATE = """You are an expert email writer. Draft an email based on this request:
+
+REQUEST: {instruction}
+RECIPIENT: {recipient_display}
+TONE: {tone}
+CURRENT DATE: {current_date}
+
+IMPORTANT:
+1. Return ONLY a JSON object.
+2. Field "subject": A professional subject line.
+3. Field "body": Full email body.
+   - Use the REAL CURRENT DATE ({current_date}) where appropriate.
+   - DO NOT USE PLACEHOLDERS like [Date], [Current Date], or [Your Name].
+   - Use '{user_name}' as the sender name.
+   - Use '{greeting}' as the greeting if a name is provided.
+4. Field "to": "{to}"
+
+Do NOT include any markdown formatting or explanation. Return ONLY the JSON."""
+
 
 class EmailAssistant:
     """
@@ -32,8 +68,15 @@ class EmailAssistant:
     """
     
     def __init__(self):
-        self.drafts_dir = Path.home() / "Documents" / "AURA_Drafts"
-        self.drafts_dir.mkdir(exist_ok=True)
+        self.drafts_dir = _DRAFTS_DIR
+        self._drafts_dir_ready = False  # created lazily on first save_draft
+        self._outlook_app = None  # cached Outlook.Application COM object
+
+        try:
+            from user_config import get_user_name
+            self._user_name = get_user_name()
+        except ImportError:
+            self._user_name = "User"
 
         # --- Email Assistant uses its own dedicated API key ---
         # Set GEMINI_API_KEY_EMAIL in .env to isolate email quota.
@@ -41,10 +84,14 @@ class EmailAssistant:
         if email_key:
             self._client = genai.Client(api_key=email_key)
             self._model = "gemini-2.5-flash"
+            # Bind the stream entry point once so draft_email does a single
+            # attribute load per call instead of client.models.generate_... chains.
+            self._generate_stream = self._client.models.generate_content_stream
             print(f"[Email] Client ready. Key: {email_key[:10]}...{email_key[-4:]} (GEMINI_API_KEY_EMAIL)")
         else:
             self._client = None
             self._model = None
+            self._generate_stream = None
             print("[Email] ⚠️  No API key — set GEMINI_API_KEY_EMAIL or GEMINI_API_KEY in .env")
     
     def draft_email(self, instruction: str, recipient: str = None, 
@@ -71,41 +118,28 @@ class EmailAssistant:
         print(f"🎨 Tone: {tone}")
         print(f"{'='*50}\n")
         
-        try:
-            from user_config import get_user_name
-            user_name = get_user_name()
-        except ImportError:
-            user_name = "User"
-
         from datetime import datetime
         current_date = datetime.now().strftime("%B %d, %Y")
-        
-        prompt = f"""You are an expert email writer. Draft an email based on this request:
 
-REQUEST: {instruction}
-RECIPIENT: {recipient or 'Not specified'}
-TONE: {tone}
-CURRENT DATE: {current_date}
-
-IMPORTANT:
-1. Return ONLY a JSON object.
-2. Field "subject": A professional subject line.
-3. Field "body": Full email body. 
-   - Use the REAL CURRENT DATE ({current_date}) where appropriate.
-   - DO NOT USE PLACEHOLDERS like [Date], [Current Date], or [Your Name].
-   - Use '{user_name}' as the sender name.
-   - Use '{recipient or 'Recipient'}' as the greeting if a name is provided.
-4. Field "to": "{recipient or ''}"
-
-Do NOT include any markdown formatting or explanation. Return ONLY the JSON."""
+        prompt = _DRAFT_PROMPT_TEMPLATE.format(
+            instruction=instruction,
+            recipient_display=recipient or "Not specified",
+            tone=tone,
+            current_date=current_date,
+            user_name=self._user_name,
+            greeting=recipient or "Recipient",
+            to=recipient or "",
+        )
 
         try:
-            response = self._client.models.generate_content(
+            # Stream the response so we consume tokens as they arrive instead
+            # of blocking until the full draft is generated.
+            stream = self._generate_stream(
                 model=self._model,
                 contents=prompt,
             )
-            
-            result_text = response.text.strip()
+            parts = [chunk.text for chunk in stream if chunk.text]
+            result_text = "".join(parts).strip()
             
             # Clean JSON if wrapped in markdown
             if result_text.startswith("```"):
@@ -135,9 +169,21 @@ Do NOT include any markdown formatting or explanation. Return ONLY the JSON."""
     
     def copy_to_clipboard(self, text: str) -> bool:
         """Copy text to clipboard."""
+        # Prefer pyperclip (in-process Win32 clipboard call, microseconds)
+        # over spawning clip.exe, which costs a process + pipe per copy.
+        try:
+            import pyperclip
+            pyperclip.copy(text)
+            return True
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"[Email] Clipboard error: {e}")
+            return False
+
         try:
             import subprocess
-            # Use Windows clip command
+            # Fallback: Windows clip command
             process = subprocess.Popen(
                 ['clip'],
                 stdin=subprocess.PIPE,
@@ -154,8 +200,10 @@ Do NOT include any markdown formatting or explanation. Return ONLY the JSON."""
         Open the default email client with pre-filled content using mailto: link.
         """
         try:
-            # Build mailto URL
-            mailto = f"mailto:{quote(to)}?subject={quote(subject)}&body={quote(body)}"
+            # Build mailto URL; urlencode quotes both params in one pass and
+            # keeping '@,' safe in the address handles multiple recipients.
+            params = urlencode({'subject': subject, 'body': body}, quote_via=quote)
+            mailto = f"mailto:{quote(to, safe='@,')}?{params}"
             webbrowser.open(mailto)
             print(f"📬 Opened email client with draft")
             return True
@@ -168,45 +216,51 @@ Do NOT include any markdown formatting or explanation. Return ONLY the JSON."""
         Open Outlook with a new email draft (Windows only).
         """
         try:
-            import subprocess
-            
-            # Try Outlook COM automation
-            ps_script = f'''
-$outlook = New-Object -ComObject Outlook.Application
-$mail = $outlook.CreateItem(0)
-$mail.To = "{to}"
-$mail.Subject = "{subject.replace('"', "'")}"
-$mail.Body = @"
-{body.replace('"', "'")}
-"@
-$mail.Display()
-'''
-            subprocess.run(["powershell", "-Command", ps_script], capture_output=True)
+            # Direct COM automation via pywin32 — no PowerShell process or
+            # quote-mangling; the Outlook app object is cached after first use.
+            import win32com.client
+
+            if self._outlook_app is None:
+                self._outlook_app = win32com.client.Dispatch("Outlook.Application")
+
+            mail = self._outlook_app.CreateItem(0)  # 0 = olMailItem
+            mail.To = to
+            mail.Subject = subject
+            mail.Body = body
+            mail.Display()
             print(f"📬 Opened Outlook with draft")
             return True
         except Exception as e:
             print(f"❌ Outlook automation failed: {e}")
+            self._outlook_app = None
             # Fallback to mailto
             return self.open_in_email_client(to, subject, body)
     
     def save_draft(self, subject: str, body: str, to: str = "") -> str:
         """Save draft to file for reference."""
         from datetime import datetime
-        
-        # Create filename from subject
-        safe_subject = "".join(c if c.isalnum() or c in " -_" else "_" for c in subject[:30])
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{safe_subject}.txt"
+
+        if not self._drafts_dir_ready:
+            self.drafts_dir.mkdir(parents=True, exist_ok=True)
+            self._drafts_dir_ready = True
+
+        # Create filename from subject; one now() serves both timestamps
+        now = datetime.now()
+        safe_subject = subject[:30].translate(_SANITIZE_TABLE)
+        filename = f"{now.strftime('%Y%m%d_%H%M%S')}_{safe_subject}.txt"
         
         filepath = self.drafts_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"To: {to}\n")
-            f.write(f"Subject: {subject}\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-            f.write(f"\n{'-'*40}\n\n")
-            f.write(body)
-        
+
+        # One string, one encode, one write — instead of six buffered writes.
+        payload = (
+            f"To: {to}\n"
+            f"Subject: {subject}\n"
+            f"Date: {now.strftime('%Y-%m-%d %H:%M')}\n"
+            f"\n{'-'*40}\n\n"
+            f"{body}"
+        )
+        filepath.write_text(payload, encoding='utf-8')
+
         print(f"💾 Saved draft to: {filepath}")
         return str(filepath)
 
@@ -228,30 +282,35 @@ $mail.Display()
         import ssl
         import os
         
-        smtp_server = os.environ.get("SMTP_SERVER")
-        smtp_port = os.environ.get("SMTP_PORT")
-        sender_email = os.environ.get("SMTP_EMAIL")
-        password = os.environ.get("SMTP_PASSWORD")
-        
-        missing = []
-        if not smtp_server: missing.append("SMTP_SERVER")
-        if not smtp_port: missing.append("SMTP_PORT")
-        if not sender_email: missing.append("SMTP_EMAIL")
-        if not password: missing.append("SMTP_PASSWORD")
-        
-        if missing:
+        env_get = os.environ.get
+        smtp_server, smtp_port, sender_email, password = (
+            env_get(name) for name in
+            ("SMTP_SERVER", "SMTP_PORT", "SMTP_EMAIL", "SMTP_PASSWORD")
+        )
+
+        if not (smtp_server and smtp_port and sender_email and password):
+            missing = [name for name, value in (
+                ("SMTP_SERVER", smtp_server), ("SMTP_PORT", smtp_port),
+                ("SMTP_EMAIL", sender_email), ("SMTP_PASSWORD", password),
+            ) if not value]
             return False, f"SMTP configuration missing: {', '.join(missing)}. Please check your .env file."
             
         try:
             port = int(smtp_port)
             context = ssl.create_default_context()
             
-            message = f"Subject: {subject}\nTo: {to}\nFrom: {sender_email}\n\n{body}"
-            
+            # EmailMessage handles header encoding/escaping — safe against
+            # newline injection in subject/to and works with non-ASCII bodies.
+            msg = EmailMessage()
+            msg["Subject"] = subject
+            msg["From"] = sender_email
+            msg["To"] = to
+            msg.set_content(body)
+
             with smtplib.SMTP(smtp_server, port) as server:
                 server.starttls(context=context)
                 server.login(sender_email, password)
-                server.sendmail(sender_email, to, message)
+                server.send_message(msg)
                 
             print(f"📧 Sent email to {to} via {smtp_server}")
             return True, f"Email sent successfully to {to}!"
@@ -3,8 +3,9 @@ AURA Goal-Driven Architecture - Goal Object
 Semantic, app-agnostic representation of user intent.
 """
 
+import sys
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Any, List, Tuple
 from enum import Enum
 
 
@@ -41,32 +42,66 @@ class GoalType(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
-@dataclass
+# O(1) string -> member lookup; the GoalType(...) call path goes through
+# Enum.__new__ and is noticeably slower for high-volume goal construction.
+_GOAL_TYPE_MAP = {member.value: member for member in GoalType}
+
+
+@dataclass(frozen=True, slots=True)
 class Goal:
     """
     Semantic representation of what the user wants.
     App-agnostic - does not specify HOW to do it.
-    
+
+    Frozen so goals are hashable and can key caches (repeated commands
+    like "pause" map to the same goal). Modifiers are stored as a sorted
+    tuple of (key, value) pairs; use modifier() to read one.
+
     Examples:
     - "play some jazz" → Goal(type=PLAY_MEDIA, content="jazz")
-    - "pause" → Goal(type=CONTROL_MEDIA, modifiers={"action": "pause"})
+    - "pause" → create_goal("CONTROL_MEDIA", action="pause")
     - "open netflix and play stranger things" → Goal(type=PLAY_MEDIA, content="stranger things", preference="netflix")
     """
     type: GoalType
     content: str = ""           # What to play/search/send
     preference: str = ""        # Which app/service (spotify, netflix, gmail)
-    modifiers: Dict[str, Any] = field(default_factory=dict)
+    modifiers: Tuple[Tuple[str, Any], ...] = ()
     raw_command: str = ""       # Original user command
-    
+
     # Confidence from LLM
     confidence: float = 0.9
-    
+
+    # Lowercase caches, computed once at construction. Strategy
+    # applicability checks read these instead of re-lowercasing the same
+    # strings on every probe. Excluded from eq/hash/repr.
+    pref_lc: str = field(init=False, repr=False, compare=False, default="")
+    action_lc: str = field(init=False, repr=False, compare=False, default="")
+
     def __post_init__(self):
         if isinstance(self.type, str):
-            self.type = GoalType(self.type)
+            object.__setattr__(
+                self, "type", _GOAL_TYPE_MAP.get(self.type, GoalType.UNKNOWN)
+            )
+        if isinstance(self.modifiers, dict):
+            object.__setattr__(
+                self, "modifiers", tuple(sorted(self.modifiers.items()))
+            )
+        object.__setattr__(self, "pref_lc", sys.intern(self.preference.lower()))
+        action = self.modifier("action", "")
+        if isinstance(action, str):
+            # Interned so lookups against literal-keyed tables compare by
+            # pointer, not character-by-character.
+            object.__setattr__(self, "action_lc", sys.intern(action.lower()))
 
+    def modifier(self, key: str, default: Any = None) -> Any:
+        """Look up a single modifier value."""
+        for k, v in self.modifiers:
+            if k == key:
+                return v
+        return default
 
-@dataclass
+
+@dataclass(slots=True)
 class ActionStep:
     """
     Single atomic action in a human action plan.
@@ -91,13 +126,23 @@ class ActionStep:
     # For SCROLL action
     clicks: int = 3
 
+    # For KEY_REPEAT action
+    count: int = 1
+
 
-@dataclass
+@dataclass(slots=True)
 class HumanActionPlan:
     """
     A sequence of atomic actions that achieve a goal.
     This is what a human would do step by step.
-    
+
+    Steps are stored as a tagged array — a column of step types plus a
+    column of per-step argument tuples — instead of a list of ActionStep
+    objects, so each step only carries the fields its type actually uses
+    and no ActionStep instances exist on the execution hot path (the
+    executor dispatches on the type tag and reads the args tuple
+    directly; ActionStep is only materialized for callbacks/debugging).
+
     Example for "play jazz on spotify":
     1. Press Win key
     2. Type "spotify"
@@ -107,16 +152,69 @@ class HumanActionPlan:
     6. Type "jazz"
     7. Press Enter
     """
-    steps: List[ActionStep] = field(default_factory=list)
     description: str = ""
     goal: Optional[Goal] = None
-    
+
     # For recovery
     fallback_plan: Optional['HumanActionPlan'] = None
-    
+
+    # Tagged-array step storage: step_types[i] names the action,
+    # step_args[i] holds only the operands that action needs.
+    #   KEY/HOTKEY -> (key, ...)    TYPE       -> (text,)
+    #   WAIT       -> (ms,)         CLICK      -> (x, y, button)
+    #   SCROLL     -> (clicks,)     KEY_REPEAT -> (key, count)
+    #   PASTE      -> (text,)       SHELL_OPEN -> (target,)
+    step_types: List[str] = field(default_factory=list, init=False, repr=False)
+    step_args: List[tuple] = field(default_factory=list, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.step_types)
+
+    @property
+    def steps(self) -> List[ActionStep]:
+        """Materialize the steps as ActionStep objects (debug/inspection)."""
+        return [self._make_step(i) for i in range(len(self.step_types))]
+
+    def _make_step(self, i: int) -> ActionStep:
+        step_type = self.step_types[i]
+        args = self.step_args[i]
+        if step_type in ("KEY", "HOTKEY"):
+            return ActionStep(type=step_type, keys=list(args))
+        if step_type in ("TYPE", "PASTE", "SHELL_OPEN"):
+            return ActionStep(type=step_type, text=args[0])
+        if step_type == "WAIT":
+            return ActionStep(type=step_type, ms=args[0])
+        if step_type == "CLICK":
+            return ActionStep(type=step_type, x=args[0], y=args[1], button=args[2])
+        if step_type == "SCROLL":
+            return ActionStep(type=step_type, clicks=args[0])
+        if step_type == "KEY_REPEAT":
+            return ActionStep(type=step_type, keys=[args[0]], count=args[1])
+        return ActionStep(type=step_type)
+
     def add_step(self, step_type: str, **kwargs) -> 'HumanActionPlan':
         """Fluent interface for building plans"""
-        self.steps.append(ActionStep(type=step_type, **kwargs))
+        if step_type in ("KEY", "HOTKEY"):
+            args = tuple(kwargs.get("keys", ()))
+        elif step_type in ("TYPE", "PASTE", "SHELL_OPEN"):
+            args = (kwargs.get("text", ""),)
+        elif step_type == "WAIT":
+            # Coalesce back-to-back waits into one sleep; fewer steps for
+            # the executor to dispatch with identical timing.
+            if self.step_types and self.step_types[-1] == "WAIT":
+                self.step_args[-1] = (self.step_args[-1][0] + kwargs.get("ms", 500),)
+                return self
+            args = (kwargs.get("ms", 500),)
+        elif step_type == "CLICK":
+            args = (kwargs.get("x"), kwargs.get("y"), kwargs.get("button", "left"))
+        elif step_type == "SCROLL":
+            args = (kwargs.get("clicks", 3),)
+        elif step_type == "KEY_REPEAT":
+            args = (kwargs.get("key", ""), kwargs.get("count", 1))
+        else:
+            args = ()
+        self.step_types.append(step_type)
+        self.step_args.append(args)
         return self
     
     def key(self, *keys) -> 'HumanActionPlan':
@@ -130,10 +228,22 @@ class HumanActionPlan:
     def type_text(self, text: str) -> 'HumanActionPlan':
         """Add typing action"""
         return self.add_step("TYPE", text=text)
+
+    def paste(self, text: str) -> 'HumanActionPlan':
+        """Add text via clipboard paste - one event instead of N keystrokes"""
+        return self.add_step("PASTE", text=text)
+
+    def shell_open(self, target: str) -> 'HumanActionPlan':
+        """Open a URL/file via the OS shell - no window scripting needed"""
+        return self.add_step("SHELL_OPEN", text=target)
     
     def wait(self, ms: int = 500) -> 'HumanActionPlan':
         """Add wait action"""
         return self.add_step("WAIT", ms=ms)
+
+    def key_repeat(self, key: str, count: int) -> 'HumanActionPlan':
+        """Add a key pressed count times as a single step"""
+        return self.add_step("KEY_REPEAT", key=key, count=count)
     
     def click(self, x: int = None, y: int = None, button: str = "left") -> 'HumanActionPlan':
         """Add click action"""
@@ -144,8 +254,8 @@ class HumanActionPlan:
 def create_goal(goal_type: str, content: str = "", preference: str = "", **modifiers) -> Goal:
     """Create a goal from LLM output"""
     return Goal(
-        type=GoalType(goal_type) if isinstance(goal_type, str) else goal_type,
+        type=_GOAL_TYPE_MAP.get(goal_type, GoalType.UNKNOWN) if isinstance(goal_type, str) else goal_type,
         content=content,
         preference=preference,
-        modifiers=modifiers
+        modifiers=tuple(sorted(modifiers.items()))
     )
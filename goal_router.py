@@ -0,0 +1,470 @@
+"""
+AURA Goal-Driven Architecture - Goal Router
+Extracts semantic goals from natural language using the LLM,
+then routes them through the strategy planner and plan executor.
+
+Flow:
+    "play some jazz on spotify"
+        → Goal(type=PLAY_MEDIA, content="jazz", preference="spotify")
+        → SpotifyStrategy builds a HumanActionPlan
+        → PlanExecutor presses the keys
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import random
+import re
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# orjson parses LLM responses 2-6x faster; fall back to stdlib if absent
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+from goal import Goal, GoalType, create_goal
+
+# Sentinel responses understood by aura_v2_bridge
+NEEDS_FUNCTION_EXECUTOR = "NEEDS_FUNCTION_EXECUTOR"
+NEEDS_CODE_GENERATION = "NEEDS_CODE_GENERATION"
+
+# Matches goal_type as soon as it streams in (see _stream_response)
+_GOAL_TYPE_RE = re.compile(r'"goal_type"\s*:\s*"([^"]+)"')
+
+# Structured-output schema: Gemini constrains decoding to valid JSON of
+# this shape, so responses never carry markdown fences or prose and the
+# old regex/brace-hunting recovery path is unnecessary.
+_GOAL_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "goal_type": {"type": "STRING"},
+        "content": {"type": "STRING"},
+        "preference": {"type": "STRING"},
+        "modifiers": {
+            "type": "OBJECT",
+            "properties": {
+                "action": {"type": "STRING"},
+                "control": {"type": "STRING"},
+                "type": {"type": "STRING"},
+                "level": {"type": "INTEGER", "nullable": True},
+            },
+        },
+        "confidence": {"type": "NUMBER"},
+    },
+    "required": ["goal_type"],
+}
+
+_GOAL_GEN_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": _GOAL_RESPONSE_SCHEMA,
+}
+
+# Trivial commands that map 1:1 to a goal — answered in microseconds,
+# no LLM round-trip. Goals are frozen, so sharing the instances is safe.
+_FAST_PATH = [
+    (re.compile(r"(?:pause|pause (?:it|music|the music))", re.I),
+     create_goal("CONTROL_MEDIA", action="pause")),
+    (re.compile(r"(?:play|resume)(?: (?:it|music|the music))?", re.I),
+     create_goal("CONTROL_MEDIA", action="play")),
+    (re.compile(r"(?:next|skip|next (?:track|song)|skip (?:this|track|song))", re.I),
+     create_goal("CONTROL_MEDIA", action="next")),
+    (re.compile(r"(?:previous|prev|previous (?:track|song)|last (?:track|song))", re.I),
+     create_goal("CONTROL_MEDIA", action="previous")),
+    (re.compile(r"stop(?: (?:music|playback|playing))?", re.I),
+     create_goal("CONTROL_MEDIA", action="stop")),
+    (re.compile(r"mute", re.I),
+     create_goal("CONTROL_MEDIA", action="mute")),
+    (re.compile(r"(?:volume up|turn (?:the )?volume up|louder)", re.I),
+     create_goal("SYSTEM_CONTROL", control="volume", action="up")),
+    (re.compile(r"(?:volume down|turn (?:the )?volume down|quieter)", re.I),
+     create_goal("SYSTEM_CONTROL", control="volume", action="down")),
+]
+
+
+def _fast_path_goal(command: str) -> Optional[Goal]:
+    """Return a prebuilt Goal for trivial commands, or None."""
+    for pattern, goal in _FAST_PATH:
+        if pattern.fullmatch(command):
+            return goal
+    return None
+
+
+class GoalRouter:
+    """
+    Extracts a Goal from a user command and executes it via strategies.
+
+    Uses the shared ai_client (lazy-loaded) for goal extraction.
+    """
+
+    GOAL_EXTRACTION_PROMPT = """You are a goal extractor for a voice assistant. Given a user command, extract the user's underlying goal.
+
+GOAL TYPES:
+- PLAY_MEDIA: play music/video/show (content=what, preference=spotify/youtube/netflix)
+- CONTROL_MEDIA: pause/play/next/previous/stop/mute (modifiers.action)
+- CHECK_EMAIL: open/check email inbox (preference=gmail/outlook)
+- SEND_EMAIL: compose/send an email
+- SEND_MESSAGE: send a chat message (whatsapp/telegram)
+- OPEN_APP: open an application (content=app name)
+- CLOSE_APP: close an application (content=app name)
+- SYSTEM_CONTROL: volume/brightness (modifiers.control, modifiers.action, modifiers.level)
+- FILE_OPERATION: file create/move/delete
+- WEB_SEARCH: search the web (content=query)
+- OPEN_WEBSITE: open a specific site (content=url or site name)
+- CREATE_CONTENT: create an app/document/presentation
+- CONVERSATION: general chat/question, no action needed
+- UNKNOWN: anything else
+
+USER COMMAND: "{command}"
+
+Respond ONLY with valid JSON in this exact format:
+{{"goal_type": "TYPE", "content": "...", "preference": "...", "modifiers": {{}}, "confidence": 0.0}}
+
+Examples:
+- "play some jazz" -> {{"goal_type": "PLAY_MEDIA", "content": "jazz", "preference": "", "modifiers": {{}}, "confidence": 0.95}}
+- "pause" -> {{"goal_type": "CONTROL_MEDIA", "content": "", "preference": "", "modifiers": {{"action": "pause"}}, "confidence": 0.98}}
+- "turn the volume up" -> {{"goal_type": "SYSTEM_CONTROL", "content": "", "preference": "", "modifiers": {{"control": "volume", "action": "up"}}, "confidence": 0.95}}
+- "open netflix and play stranger things" -> {{"goal_type": "PLAY_MEDIA", "content": "stranger things", "preference": "netflix", "modifiers": {{}}, "confidence": 0.9}}
+
+Do NOT include markdown formatting or explanation. Return ONLY the JSON."""
+
+    # Compact prompts used when the session context suggests a likely goal
+    # category — a fraction of the full template's input tokens, so prefill
+    # is proportionally faster. Each must still allow an escape hatch to
+    # UNKNOWN so a wrong hint costs one cheap round-trip, not a wrong goal.
+    SPECIALIZED_PROMPTS = {
+        GoalType.CONTROL_MEDIA: """Extract a media-control goal from this voice command.
+USER COMMAND: "{command}"
+Respond ONLY with JSON: {{"goal_type": "CONTROL_MEDIA", "content": "", "preference": "", "modifiers": {{"action": "play|pause|next|previous|stop|mute"}}, "confidence": 0.0}}
+If this is NOT a media-control command, respond: {{"goal_type": "UNKNOWN", "content": "", "preference": "", "modifiers": {{}}, "confidence": 0.0}}""",
+        GoalType.SYSTEM_CONTROL: """Extract a system-control goal from this voice command.
+USER COMMAND: "{command}"
+Respond ONLY with JSON: {{"goal_type": "SYSTEM_CONTROL", "content": "", "preference": "", "modifiers": {{"control": "volume|brightness", "action": "up|down|mute", "level": null}}, "confidence": 0.0}}
+If this is NOT a system-control command, respond: {{"goal_type": "UNKNOWN", "content": "", "preference": "", "modifiers": {{}}, "confidence": 0.0}}""",
+        GoalType.PLAY_MEDIA: """Extract a play-media goal from this voice command.
+USER COMMAND: "{command}"
+Respond ONLY with JSON: {{"goal_type": "PLAY_MEDIA", "content": "what to play", "preference": "spotify|youtube|netflix or empty", "modifiers": {{}}, "confidence": 0.0}}
+If this is NOT a play-media command, respond: {{"goal_type": "UNKNOWN", "content": "", "preference": "", "modifiers": {{}}, "confidence": 0.0}}""",
+    }
+
+    def __init__(self):
+        # Imported here, not at module top: strategy_planner/plan_executor
+        # drag in keyboard/mouse automation libs, which slows cold start for
+        # modules that import goal_router without instantiating the router.
+        # (goal itself is lightweight and stays a top-level import.)
+        from strategy_planner import get_strategy_planner
+        from context_engine import get_context_engine
+
+        self.planner = get_strategy_planner()
+        self.context = get_context_engine()
+        self._ai_client = None
+        self._generate = None         # bound sync generate_content
+        self._generate_stream = None  # bound sync generate_content_stream
+        self._generate_async = None   # bound async generate_content
+        self._model = "gemini-2.5-flash"
+        # Pre-split the extraction template so per-call prompt assembly is
+        # plain concatenation instead of re-parsing the 1.5KB format string.
+        prefix, suffix = self.GOAL_EXTRACTION_PROMPT.split("{command}")
+        self._prompt_prefix = prefix.replace("{{", "{").replace("}}", "}")
+        self._prompt_suffix = suffix.replace("{{", "{").replace("}}", "}")
+        # Specialized templates, pre-split the same way, keyed by hint
+        self._prompts_by_hint = {}
+        for goal_type, template in self.SPECIALIZED_PROMPTS.items():
+            p, s = template.split("{command}")
+            self._prompts_by_hint[goal_type] = (
+                p.replace("{{", "{").replace("}}", "}"),
+                s.replace("{{", "{").replace("}}", "}"),
+            )
+        # Last successfully routed goal type — used as the extraction hint
+        self._last_goal_type: Optional[GoalType] = None
+        # Batch extraction concurrency cap — keeps us under the API RPM limit.
+        self._max_concurrency = 10
+        # Thread pool for batch extraction from async contexts (lazy; see
+        # extract_goals_batch). Workers idle at ~8KB each, so keeping the
+        # pool alive between batches is cheaper than respawning threads.
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # Repeat commands ("pause", "next", "play jazz") skip the LLM
+        # entirely; Goal is frozen so cached instances are safe to share.
+        self._goal_cache: dict = {}
+        self._goal_cache_max = 512
+        logging.info("Goal Router initialized")
+
+    @property
+    def ai_client(self):
+        """Lazy load AI client.
+
+        Pinned once for the router's lifetime: the google-genai Client owns a
+        persistent connection pool, so reusing the same instance amortizes the
+        TLS handshake across every goal extraction instead of paying it per
+        call. The bound generate methods are cached alongside it.
+        """
+        if self._ai_client is None:
+            try:
+                from ai_client import ai_client
+                self._ai_client = ai_client
+                self._generate = ai_client.client.models.generate_content
+                self._generate_stream = ai_client.client.models.generate_content_stream
+                self._generate_async = ai_client.client.aio.models.generate_content
+            except Exception as e:
+                logging.error(f"[GoalRouter] Could not load AI client: {e}")
+        return self._ai_client
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # GOAL EXTRACTION
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def extract_goal(self, command: str, hint: Optional[GoalType] = None) -> Optional[Goal]:
+        """Extract a Goal from a natural language command via the LLM.
+
+        When `hint` names a goal category we have a specialized (much
+        shorter) prompt for, try that first; a hinted extraction that
+        comes back UNKNOWN falls through to the full template.
+        """
+        command = self._clean_command(command)
+        if not command:
+            return None
+
+        fast = _fast_path_goal(command)
+        if fast is not None:
+            logging.info(f"[GoalRouter] Fast path: '{command}' -> {fast.type.value}")
+            return fast
+
+        cached = self._goal_cache.get(command)
+        if cached is not None:
+            logging.info(f"[GoalRouter] Goal cache hit: '{command}'")
+            return cached
+
+        if not self.ai_client:
+            return None
+
+        hinted = self._prompts_by_hint.get(hint) if hint is not None else None
+        if hinted is not None:
+            prompt = hinted[0] + command + hinted[1]
+        else:
+            prompt = self._prompt_prefix + command + self._prompt_suffix
+
+        max_retries = 3
+
+        for attempt in range(max_retries):
+            try:
+                response_text = self._stream_response(prompt)
+                goal = self._goal_from_response(response_text, command)
+                if goal is not None and goal.type == GoalType.UNKNOWN and hinted is not None:
+                    # Wrong hint - redo with the full template
+                    logging.info(f"[GoalRouter] Hint {hint.value} missed, retrying full prompt")
+                    return self.extract_goal(command)
+                if goal is not None:
+                    self._cache_goal(command, goal)
+                return goal
+            except Exception as e:
+                error_str = str(e)
+                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "quota" in error_str.lower():
+                    if attempt < max_retries - 1:
+                        # Jittered backoff (1-3s, 2-6s): concurrent extractors
+                        # that hit the rate limit together wake up staggered
+                        # instead of re-colliding in lockstep.
+                        wait_time = (2 ** (attempt + 1)) * (0.5 + random.random())
+                        logging.warning(f"[GoalRouter] Rate limit hit, waiting {wait_time:.1f}s (retry {attempt + 2}/{max_retries})")
+                        time.sleep(wait_time)
+                        continue
+                logging.error(f"[GoalRouter] Goal extraction error: {e}")
+                break
+
+        return None
+
+    def extract_goals_batch(self, commands: List[str]) -> List[Optional[Goal]]:
+        """
+        Extract goals for several commands at once.
+
+        Each command is sent as its own request and the requests run
+        concurrently (bounded by a semaphore), so total latency is close to
+        the slowest single extraction rather than the sum of all of them.
+        """
+        if not commands:
+            return []
+        if len(commands) == 1:
+            return [self.extract_goal(commands[0])]
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._extract_goals_concurrent(commands))
+        # Called from inside an event loop (e.g. the widget's async shell) —
+        # asyncio.run would raise, so fan out on threads instead. The LLM
+        # calls are network-bound and release the GIL during socket reads,
+        # so a thread per command still runs them in parallel.
+        if self._pool is None:
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_concurrency
+            )
+        return list(self._pool.map(self.extract_goal, commands))
+
+    async def _extract_goals_concurrent(self, commands: List[str]) -> List[Optional[Goal]]:
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        # Dispatch shortest commands first. When there are more commands than
+        # semaphore slots this keeps a long outlier from head-of-line blocking
+        # the short ones; results scatter back to their original positions.
+        order = sorted(range(len(commands)), key=lambda i: len(commands[i]))
+        tasks = [self._extract_goal_async(commands[i], semaphore) for i in order]
+        extracted = await asyncio.gather(*tasks)
+
+        results: List[Optional[Goal]] = [None] * len(commands)
+        for orig_idx, goal in zip(order, extracted):
+            results[orig_idx] = goal
+        return results
+
+    async def _extract_goal_async(self, command: str,
+                                  semaphore: asyncio.Semaphore) -> Optional[Goal]:
+        """Async twin of extract_goal using the SDK's async client."""
+        command = self._clean_command(command)
+        if not command or not self.ai_client:
+            return None
+
+        fast = _fast_path_goal(command)
+        if fast is not None:
+            return fast
+
+        cached = self._goal_cache.get(command)
+        if cached is not None:
+            return cached
+
+        prompt = self._prompt_prefix + command + self._prompt_suffix
+        async with semaphore:
+            try:
+                response = await self._generate_async(
+                    model=self._model,
+                    contents=prompt,
+                    config=_GOAL_GEN_CONFIG,
+                )
+                goal = self._goal_from_response(response.text, command)
+                if goal is not None:
+                    self._cache_goal(command, goal)
+                return goal
+            except Exception as e:
+                logging.error(f"[GoalRouter] Async goal extraction error: {e}")
+                return None
+
+    def _stream_response(self, prompt: str) -> str:
+        """
+        Stream the LLM response, consuming tokens as they arrive.
+
+        goal_type appears first in the JSON, so as soon as it streams in we
+        warm the context lookup for that category on a side thread — the
+        preference read overlaps the tail of the LLM decode instead of
+        running after it.
+        """
+        parts = []
+        seen = ""
+        warmed = False
+        for chunk in self._generate_stream(
+            model=self._model, contents=prompt, config=_GOAL_GEN_CONFIG
+        ):
+            if not chunk.text:
+                continue
+            parts.append(chunk.text)
+            if not warmed:
+                seen += chunk.text
+                m = _GOAL_TYPE_RE.search(seen)
+                if m:
+                    warmed = True
+                    goal_type = m.group(1)
+                    threading.Thread(
+                        target=self.context.get_context_for_goal,
+                        args=(goal_type,),
+                        daemon=True,
+                    ).start()
+        return "".join(parts)
+
+    def _cache_goal(self, command: str, goal: Goal) -> None:
+        """Remember an extracted goal, evicting the oldest entry when full."""
+        if len(self._goal_cache) >= self._goal_cache_max:
+            self._goal_cache.pop(next(iter(self._goal_cache)))
+        self._goal_cache[command] = goal
+
+    def _goal_from_response(self, response_text: str, command: str) -> Optional[Goal]:
+        """Turn a raw LLM response into a Goal object.
+
+        With structured output enabled the response IS the JSON object —
+        no markdown fences, no surrounding prose — so this is a single
+        parse with no recovery heuristics.
+        """
+        try:
+            goal_data = _json_loads(response_text)
+        except ValueError:
+            logging.error(f"[GoalRouter] Could not parse response: {response_text[:200]}")
+            return None
+        if not isinstance(goal_data, dict):
+            return None
+
+        # Goal.__post_init__ resolves type strings through goal._GOAL_TYPE_MAP
+        # (O(1) dict hit, unknown values become UNKNOWN) — no enum call here.
+        return Goal(
+            type=goal_data.get("goal_type", "UNKNOWN"),
+            content=goal_data.get("content", "") or "",
+            preference=goal_data.get("preference", "") or "",
+            modifiers=goal_data.get("modifiers", {}) or {},
+            raw_command=command,
+            confidence=float(goal_data.get("confidence", 0.9)),
+        )
+
+    def _clean_command(self, command: str) -> str:
+        """Normalize a command before extraction"""
+        # One C-level pass strips whitespace and wrapping quotes from both ends
+        return command.strip().strip('\'"').strip()
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # ROUTING
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def route(self, command: str) -> Tuple[str, bool]:
+        """
+        Extract the goal behind a command and execute it.
+
+        Returns:
+            (response, success). On failure the response may be one of the
+            NEEDS_* sentinels so the bridge can fall back.
+        """
+        goal = self.extract_goal(command, hint=self._last_goal_type)
+
+        if goal is None:
+            return NEEDS_CODE_GENERATION, False
+
+        self._last_goal_type = goal.type
+        logging.info(f"[GoalRouter] Goal: {goal.type.value} content='{goal.content}' pref='{goal.preference}'")
+
+        if goal.type == GoalType.CONVERSATION:
+            # Not an action - let the bridge handle chat
+            return NEEDS_FUNCTION_EXECUTOR, False
+
+        if goal.type in (GoalType.UNKNOWN, GoalType.CREATE_CONTENT, GoalType.FILE_OPERATION):
+            return NEEDS_CODE_GENERATION, False
+
+        plan = self.planner.plan(goal)
+        if plan is None or len(plan) == 0:
+            return NEEDS_FUNCTION_EXECUTOR, False
+
+        # Resolved at the point of use: the router is a process-wide
+        # singleton but executors are thread-local (separate
+        # interrupt_flag per concurrent plan), so caching one at __init__
+        # would pin every thread to the first thread's instance.
+        from plan_executor import get_plan_executor
+        success = get_plan_executor().execute(plan)
+        if success:
+            return f"Done: {plan.description}", True
+        return NEEDS_FUNCTION_EXECUTOR, False
+
+
+# Global instance
+_router_instance = None
+
+def get_goal_router() -> GoalRouter:
+    """Get the global goal router"""
+    global _router_instance
+    if _router_instance is None:
+        _router_instance = GoalRouter()
+    return _router_instance
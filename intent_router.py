@@ -4,14 +4,378 @@ Uses LLM to understand user intent instead of regex patterns.
 If intent matches a known tool, call it. Otherwise, generate code.
 """
 
+import concurrent.futures
+import dataclasses
+import functools
 import json
 import logging
+import random
+import re
+import threading
+import time
+import types
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Mapping, Tuple
 from enum import IntEnum
 from config import config
 from google import genai
 
+# orjson parses LLM responses 2-6x faster; fall back to stdlib if absent
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Markdown code fences around LLM JSON replies, stripped in one pass
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE | re.MULTILINE)
+# Fallback extractors when the model wraps the JSON in prose
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+_JSON_ARR_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+def _parse_json_reply(text: str, pattern: "re.Pattern" = _JSON_OBJ_RE):
+    """Parse an LLM JSON reply, tolerating markdown fences and prose."""
+    text = _FENCE_RE.sub("", text).strip()
+    try:
+        return _json_loads(text)
+    except ValueError:
+        m = pattern.search(text)
+        if m:
+            return _json_loads(m.group(0))
+        raise
+
+
+# All known tools with their descriptions and parameters (raw form;
+# frozen into Tool records below)
+_RAW_TOOLS = [
+    # Volume Control
+    {"name": "set_system_volume", "description": "Set system volume to a specific level", "params": {"level": "int (0-100)"}},
+    {"name": "mute_system_volume", "description": "Mute the system audio", "params": {}},
+    {"name": "unmute_system_volume", "description": "Unmute the system audio", "params": {}},
+    {"name": "increase_volume", "description": "Increase volume", "params": {"change": "int (default 10)"}},
+    {"name": "decrease_volume", "description": "Decrease volume", "params": {"change": "int (default -10)"}},
+    
+    # Brightness Control
+    {"name": "set_brightness", "description": "Set screen brightness to a level", "params": {"level": "int (0-100)"}},
+    {"name": "increase_brightness", "description": "Increase screen brightness", "params": {"change": "int (default 20)"}},
+    {"name": "decrease_brightness", "description": "Decrease screen brightness", "params": {"change": "int (default -20)"}},
+    
+    # YouTube
+    {"name": "play_youtube", "description": "Open YouTube and play/search for music or videos", "params": {"query": "str (search query, empty to just open)"}},
+    {"name": "play_youtube_video_ultra_direct", "description": "Play a specific YouTube video directly", "params": {"query": "str"}},
+    
+    # WhatsApp Automation
+    {"name": "send_whatsapp_message", "description": "Send a WhatsApp message to a contact", "params": {"contact": "str", "message": "str"}},
+    {"name": "send_whatsapp_file", "description": "Send a file/document via WhatsApp", "params": {"contact": "str", "filename": "str", "location": "str (optional, e.g. 'Downloads')", "caption": "str (optional)"}},
+
+    # Spotify
+    {"name": "play_spotify", "description": "Open Spotify and start playing music (opens web player with Top Hits if no query)", "params": {"query": "str (song/artist/playlist, optional)"}},
+    
+    # Email
+    {"name": "open_email", "description": "Open email/Gmail inbox", "params": {}},
+    {"name": "draft_email", "description": "Draft/compose an email", "params": {"recipient": "str", "instruction": "str (what the email should be about)"}},
+    {"name": "compose_email", "description": "Compose email with subject", "params": {"to": "str", "subject": "str"}},
+    {"name": "send_email", "description": "Send an email via SMTP", "params": {"to": "str", "subject": "str", "body": "str"}},
+    
+    # App Creation (Agentic - generates, tests, fixes code automatically)
+    {"name": "create_app", "description": "Create a Python app/application with GUI (calculator, todo list, game, etc). Generates code, tests it, fixes errors automatically.", "params": {"description": "str (what kind of app to create)", "app_name": "str (optional)"}},
+    
+    # Applications
+    {"name": "open_application", "description": "Open/launch an application", "params": {"app_name": "str"}},
+    {"name": "close_application", "description": "Close/exit an application", "params": {"app_name": "str"}},
+    
+    # File Operations
+    {"name": "open_file_explorer", "description": "Open file explorer/file manager", "params": {}},
+    # NOTE: create_folder, create_file, create_powerpoint_presentation, create_ai_news_file
+    # are intentionally NOT listed here — all file/document creation goes to GENERATE_CODE
+    # so the code generator handles any complexity of content creation.
+    
+    # System Operations
+    {"name": "take_screenshot", "description": "Take a screenshot", "params": {}},
+    {"name": "open_camera_app", "description": "Open camera app", "params": {}},
+    {"name": "lock_workstation", "description": "Lock the computer/screen", "params": {}},
+    {"name": "restart_explorer", "description": "Restart Windows Explorer", "params": {}},
+    {"name": "empty_recycle_bin", "description": "Empty the recycle bin", "params": {}},
+    {"name": "night_light_on", "description": "Turn on night light/blue light filter", "params": {}},
+    {"name": "night_light_off", "description": "Turn off night light", "params": {}},
+    {"name": "airplane_mode_on", "description": "Enable airplane mode", "params": {}},
+    {"name": "airplane_mode_off", "description": "Disable airplane mode", "params": {}},
+    {"name": "hide_desktop_icons", "description": "Hide desktop icons", "params": {}},
+    {"name": "show_desktop_icons", "description": "Show desktop icons", "params": {}},
+    {"name": "system_info", "description": "Show system info (battery, CPU, RAM)", "params": {}},
+    {"name": "shutdown_computer", "description": "Shutdown the computer", "params": {}},
+    {"name": "restart_computer", "description": "Restart/reboot the computer", "params": {}},
+    {"name": "sleep_computer", "description": "Put computer to sleep", "params": {}},
+    
+    # Calculator
+    {"name": "open_calculator", "description": "Open calculator app", "params": {}},
+    {"name": "calculate", "description": "Calculate a math expression", "params": {"expression": "str"}},
+    
+    # Clipboard
+    {"name": "copy_text", "description": "Copy text/selection", "params": {}},
+    {"name": "paste_text", "description": "Paste text", "params": {}},
+    
+    # Time/Date
+    {"name": "get_time", "description": "Get current time", "params": {}},
+    {"name": "get_date", "description": "Get current date", "params": {}},
+    
+    # Web/Search
+    {"name": "google_search", "description": "Search Google for something", "params": {"query": "str"}},
+    {"name": "open_website", "description": "Open a website URL", "params": {"url": "str"}},
+    
+    # Weather
+    {"name": "get_weather", "description": "Get weather information", "params": {"location": "str (optional)"}},
+    
+    # Timer/Reminder
+    {"name": "set_timer", "description": "Set a timer", "params": {"duration": "str", "unit": "str (minutes/hours/seconds)"}},
+    {"name": "set_reminder", "description": "Set a reminder", "params": {"message": "str"}},
+    
+    # Media Control
+    {"name": "play_media", "description": "Resume/play currently paused media (press play button)", "params": {}},
+    {"name": "pause_media", "description": "Pause currently playing media", "params": {}},
+    {"name": "stop_media", "description": "Stop media playback", "params": {}},
+    {"name": "next_track", "description": "Skip to next track/song", "params": {}},
+    {"name": "previous_track", "description": "Go to previous track/song", "params": {}},
+    
+    # News (browser open - kept)
+    {"name": "get_news", "description": "Open Google News in browser to see latest headlines", "params": {}},
+    # NOTE: create_powerpoint_presentation and create_ai_news_file intentionally removed
+    # — all document/file creation goes to GENERATE_CODE for full LLM power.
+
+    # Terminal
+    {"name": "run_terminal_command", "description": "Run a terminal/command line command", "params": {"command": "str"}},
+    {"name": "open_terminal", "description": "Open terminal/PowerShell/CMD", "params": {}},
+    
+    # Keyboard
+    {"name": "type_text", "description": "Type text", "params": {"text": "str"}},
+    {"name": "press_key", "description": "Press a keyboard key", "params": {"key": "str"}},
+    {"name": "hotkey", "description": "Press keyboard shortcut/hotkey", "params": {"keys": "str"}},
+    
+    # Mouse
+    {"name": "mouse_click", "description": "Click mouse at position", "params": {"x": "int (optional)", "y": "int (optional)"}},
+    {"name": "right_click", "description": "Right click", "params": {}},
+    {"name": "double_click", "description": "Double click", "params": {}},
+    {"name": "scroll", "description": "Scroll up or down", "params": {"clicks": "int (positive=up, negative=down)"}},
+    
+    # Window Management
+    {"name": "minimize_all_windows", "description": "Minimize all windows/show desktop", "params": {}},
+    {"name": "switch_window", "description": "Switch to next window (Alt+Tab)", "params": {}},
+    {"name": "close_window", "description": "Close current window", "params": {}},
+    {"name": "maximize_window", "description": "Maximize current window", "params": {}},
+    {"name": "snap_window_left", "description": "Snap window to left half", "params": {}},
+    {"name": "snap_window_right", "description": "Snap window to right half", "params": {}},
+    
+    # Git
+    {"name": "git_status", "description": "Show git status", "params": {}},
+    {"name": "git_pull", "description": "Git pull latest changes", "params": {}},
+    {"name": "git_commit", "description": "Git commit with message", "params": {"message": "str"}},
+    {"name": "git_push", "description": "Git push changes", "params": {}},
+    
+    # WhatsApp
+    {"name": "open_whatsapp", "description": "Open WhatsApp", "params": {}},
+    {"name": "whatsapp_send_message", "description": "Send WhatsApp message", "params": {"contact": "str", "message": "str"}},
+    
+    # Screen Recording
+    {"name": "start_screen_recording", "description": "Start screen recording", "params": {}},
+    {"name": "stop_screen_recording", "description": "Stop screen recording", "params": {}},
+    
+    # Browser Control
+    {"name": "browser_task", "description": "Automate a complex browser task using AI (fill forms, extract info from websites, book tickets, interact with web pages, scrape data, do multi-step web workflows)", "params": {"task": "str (what to do in the browser)", "url": "str (optional starting URL)"}},
+    {"name": "browser_new_tab", "description": "Open new browser tab", "params": {}},
+    {"name": "browser_close_tab", "description": "Close current browser tab", "params": {}},
+    {"name": "browser_refresh", "description": "Refresh/reload page", "params": {}},
+    {"name": "browser_back", "description": "Go back in browser", "params": {}},
+    {"name": "browser_forward", "description": "Go forward in browser", "params": {}},
+    
+    # Telegram Bot
+    {"name": "start_telegram_bot", "description": "Start the Telegram bot for remote control", "params": {}},
+    {"name": "stop_telegram_bot", "description": "Stop the Telegram bot", "params": {}},
+    {"name": "send_telegram_message", "description": "Send a message to the user via Telegram", "params": {"text": "str (message to send)"}},
+    {"name": "send_telegram_file", "description": "Send a file to the user via Telegram", "params": {"file_path": "str (path to file)", "caption": "str (optional)"}},
+    {"name": "send_telegram_photo", "description": "Send a photo/image via Telegram", "params": {"photo_path": "str (path to image)", "caption": "str (optional)"}},
+    
+    # Shortcuts
+    {"name": "select_all", "description": "Select all (Ctrl+A)", "params": {}},
+    {"name": "undo", "description": "Undo (Ctrl+Z)", "params": {}},
+    {"name": "redo", "description": "Redo (Ctrl+Y)", "params": {}},
+    {"name": "save", "description": "Save file (Ctrl+S)", "params": {}},
+    {"name": "find", "description": "Find in page", "params": {"query": "str"}},
+]
+
+
+@dataclass(frozen=True, slots=True)
+class Tool:
+    """One routable tool, with its prompt line fragment pre-rendered"""
+    name: str
+    description: str
+    params_str: str
+    param_names: Tuple[str, ...]
+
+
+# Frozen at import: slot-based records iterate faster than dicts and the
+# params string is rendered once instead of on every prompt build.
+KNOWN_TOOLS: Tuple[Tool, ...] = tuple(
+    Tool(
+        name=d["name"],
+        description=d["description"],
+        params_str=", ".join(f"{k}: {v}" for k, v in d["params"].items()) or "none",
+        param_names=tuple(d["params"]),
+    )
+    for d in _RAW_TOOLS
+)
+del _RAW_TOOLS
+
+# Hashed lookups for validating LLM-suggested tool names - no per-call
+# list rebuild or linear scan on the classification hot path.
+_TOOL_NAMES = frozenset(t.name for t in KNOWN_TOOLS)
+_TOOL_BY_NAME = {t.name: t for t in KNOWN_TOOLS}
+
+# Canonical phrasings of unambiguous commands mapped straight to their
+# tool. These form the Zipf head of real voice traffic ("pause", "mute",
+# "take screenshot"), so resolving them with a dict lookup avoids an LLM
+# round-trip for a large share of commands.
+_DIRECT_MAP = {
+    # Media
+    "pause": ("pause_media", {}),
+    "pause music": ("pause_media", {}),
+    "pause the music": ("pause_media", {}),
+    "play": ("play_media", {}),
+    "resume": ("play_media", {}),
+    "resume music": ("play_media", {}),
+    "stop": ("stop_media", {}),
+    "stop music": ("stop_media", {}),
+    "next": ("next_track", {}),
+    "next track": ("next_track", {}),
+    "next song": ("next_track", {}),
+    "skip": ("next_track", {}),
+    "previous": ("previous_track", {}),
+    "previous track": ("previous_track", {}),
+    "previous song": ("previous_track", {}),
+    # Volume
+    "mute": ("mute_system_volume", {}),
+    "mute volume": ("mute_system_volume", {}),
+    "unmute": ("unmute_system_volume", {}),
+    "unmute volume": ("unmute_system_volume", {}),
+    "volume up": ("increase_volume", {}),
+    "volume down": ("decrease_volume", {}),
+    # System
+    "take screenshot": ("take_screenshot", {}),
+    "take a screenshot": ("take_screenshot", {}),
+    "screenshot": ("take_screenshot", {}),
+    "lock": ("lock_workstation", {}),
+    "lock screen": ("lock_workstation", {}),
+    "lock the computer": ("lock_workstation", {}),
+    "empty recycle bin": ("empty_recycle_bin", {}),
+    "empty the recycle bin": ("empty_recycle_bin", {}),
+    "restart explorer": ("restart_explorer", {}),
+    "night light on": ("night_light_on", {}),
+    "night light off": ("night_light_off", {}),
+    "system info": ("system_info", {}),
+    # Apps / files
+    "open calculator": ("open_calculator", {}),
+    "open camera": ("open_camera_app", {}),
+    "open file explorer": ("open_file_explorer", {}),
+    "open terminal": ("open_terminal", {}),
+    "open email": ("open_email", {}),
+    "check email": ("open_email", {}),
+    "open whatsapp": ("open_whatsapp", {}),
+    # Time / date
+    "what time is it": ("get_time", {}),
+    "what's the time": ("get_time", {}),
+    "what is the time": ("get_time", {}),
+    "what's the date": ("get_date", {}),
+    "what date is it": ("get_date", {}),
+    # Windows
+    "minimize all windows": ("minimize_all_windows", {}),
+    "show desktop": ("minimize_all_windows", {}),
+    "switch window": ("switch_window", {}),
+    "close window": ("close_window", {}),
+    "maximize window": ("maximize_window", {}),
+    # Editing shortcuts
+    "copy": ("copy_text", {}),
+    "paste": ("paste_text", {}),
+    "select all": ("select_all", {}),
+    "undo": ("undo", {}),
+    "redo": ("redo", {}),
+    "save": ("save", {}),
+    # Git
+    "git status": ("git_status", {}),
+    "git pull": ("git_pull", {}),
+    "git push": ("git_push", {}),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _classify_prompt_parts() -> Tuple[str, str]:
+    """Static prefix/suffix of the classification prompt.
+
+    Built once so each call assembles its prompt with a single
+    concatenation instead of re-rendering a multi-KB f-string; only the
+    user command slots in between.
+    """
+    prefix = f"""You are an intent classifier for a voice assistant. Given a user command, determine which tool to use.
+
+AVAILABLE TOOLS (one JSON record per line; "n"=tool name, "p"=parameter names, "d"=description where the name is ambiguous):
+{_tools_prompt_text()}
+
+USER COMMAND: \""""
+    suffix = """\"
+
+INSTRUCTIONS:
+1. If the command matches one of the available tools, respond with the tool name and extracted parameters
+2. If the command is a general question or conversation, respond with "CONVERSATION"
+3. If no tool matches and it requires generating custom code, respond with "GENERATE_CODE"
+
+Respond ONLY with valid JSON in this exact format:
+{"action": "TOOL" or "CONVERSATION" or "GENERATE_CODE", "tool_name": "tool_name_here or null", "params": {"param_name": "value"} or {}}
+
+Examples:
+- "set volume to 50" -> {"action": "TOOL", "tool_name": "set_system_volume", "params": {"level": 50}}
+- "play despacito on youtube" -> {"action": "TOOL", "tool_name": "play_youtube", "params": {"query": "despacito"}}
+- "what is machine learning" -> {"action": "CONVERSATION", "tool_name": null, "params": {}}
+- "create a todo app with python" -> {"action": "GENERATE_CODE", "tool_name": null, "params": {}}
+- "go to github and find the most starred AI repo" -> {"action": "TOOL", "tool_name": "browser_task", "params": {"task": "find the most starred AI repo", "url": "https://github.com"}}
+- "fill out the contact form on example.com with fake data" -> {"action": "TOOL", "tool_name": "browser_task", "params": {"task": "fill out the contact form with fake data", "url": "https://example.com"}}
+
+IMPORTANT: Use "browser_task" when the user wants to interact with a website (read content, fill forms, click buttons, extract data, do multi-step web workflows). Use "open_website" or "google_search" only for simple navigation or search.
+
+JSON RESPONSE:"""
+    return prefix, suffix
+
+
+# Tools kept verbose in the prompt: the name alone doesn't convey what
+# they do or how they differ from a sibling tool.
+_VERBOSE_TOOLS = frozenset({
+    "play_youtube", "play_youtube_video_ultra_direct",
+    "browser_task", "create_app",
+    "draft_email", "compose_email", "send_email",
+    "send_whatsapp_message", "whatsapp_send_message", "send_whatsapp_file",
+    "play_spotify", "get_news", "run_terminal_command", "calculate",
+})
+
+
+@functools.lru_cache(maxsize=1)
+def _tools_prompt_text() -> str:
+    """Build the tools list for the LLM prompt.
+
+    Most tool names are self-describing, so each line is a terse JSON
+    record ({"n": name, "p": [params]}) rather than an English sentence —
+    roughly a quarter of the tokens of the verbose listing, which directly
+    cuts prefill latency on every classification. Ambiguous tools keep a
+    "d" description. Built once per process; the stable string also lets
+    the provider reuse cached prefill across calls.
+    """
+    lines = []
+    for t in KNOWN_TOOLS:
+        entry = {"n": t.name, "p": list(t.param_names)}
+        if t.name in _VERBOSE_TOOLS:
+            entry["d"] = t.description
+        lines.append(json.dumps(entry, separators=(",", ":")))
+    return "\n".join(lines)
+
 
 class MatchQuality(IntEnum):
     """Quality levels for pattern matches"""
@@ -22,185 +386,43 @@ class MatchQuality(IntEnum):
     FUZZY = 0
 
 
-@dataclass
+# Read-only sentinel shared by every RouteResult without args - most
+# tool calls are parameterless, so this saves a dict allocation apiece
+# and makes cached results safe to hand out without copying.
+_EMPTY_PARAMS: Mapping[str, Any] = types.MappingProxyType({})
+
+
+@dataclass(slots=True)
 class RouteResult:
     """Result of intent classification"""
     confidence: float
     function: Optional[str] = None
-    args: Dict[str, Any] = field(default_factory=dict)
+    # default_factory because mappingproxy is unhashable and dataclasses
+    # reject it as a plain default; the factory still returns the shared
+    # sentinel, not a new object.
+    args: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_PARAMS)
     is_conversation: bool = False
     match_type: str = "none"
     match_quality: MatchQuality = MatchQuality.FUZZY
     raw_command: str = ""
     alternatives: List[Tuple[str, float]] = field(default_factory=list)
     needs_code_generation: bool = False
-    
+
     def __post_init__(self):
         self.confidence = max(0.0, min(1.0, self.confidence))
+        # Collapse caller-supplied empty dicts onto the shared sentinel
+        if not self.args and self.args is not _EMPTY_PARAMS:
+            self.args = _EMPTY_PARAMS
 
 
 class IntentRouter:
     """LLM-based intent router - understands any natural language command"""
-    
-    # All known tools with their descriptions and parameters
-    KNOWN_TOOLS = [
-        # Volume Control
-        {"name": "set_system_volume", "description": "Set system volume to a specific level", "params": {"level": "int (0-100)"}},
-        {"name": "mute_system_volume", "description": "Mute the system audio", "params": {}},
-        {"name": "unmute_system_volume", "description": "Unmute the system audio", "params": {}},
-        {"name": "increase_volume", "description": "Increase volume", "params": {"change": "int (default 10)"}},
-        {"name": "decrease_volume", "description": "Decrease volume", "params": {"change": "int (default -10)"}},
-        
-        # Brightness Control
-        {"name": "set_brightness", "description": "Set screen brightness to a level", "params": {"level": "int (0-100)"}},
-        {"name": "increase_brightness", "description": "Increase screen brightness", "params": {"change": "int (default 20)"}},
-        {"name": "decrease_brightness", "description": "Decrease screen brightness", "params": {"change": "int (default -20)"}},
-        
-        # YouTube
-        {"name": "play_youtube", "description": "Open YouTube and play/search for music or videos", "params": {"query": "str (search query, empty to just open)"}},
-        {"name": "play_youtube_video_ultra_direct", "description": "Play a specific YouTube video directly", "params": {"query": "str"}},
-        
-        # WhatsApp Automation
-        {"name": "send_whatsapp_message", "description": "Send a WhatsApp message to a contact", "params": {"contact": "str", "message": "str"}},
-        {"name": "send_whatsapp_file", "description": "Send a file/document via WhatsApp", "params": {"contact": "str", "filename": "str", "location": "str (optional, e.g. 'Downloads')", "caption": "str (optional)"}},
 
-        # Spotify
-        {"name": "play_spotify", "description": "Open Spotify and start playing music (opens web player with Top Hits if no query)", "params": {"query": "str (song/artist/playlist, optional)"}},
-        
-        # Email
-        {"name": "open_email", "description": "Open email/Gmail inbox", "params": {}},
-        {"name": "draft_email", "description": "Draft/compose an email", "params": {"recipient": "str", "instruction": "str (what the email should be about)"}},
-        {"name": "compose_email", "description": "Compose email with subject", "params": {"to": "str", "subject": "str"}},
-        {"name": "send_email", "description": "Send an email via SMTP", "params": {"to": "str", "subject": "str", "body": "str"}},
-        
-        # App Creation (Agentic - generates, tests, fixes code automatically)
-        {"name": "create_app", "description": "Create a Python app/application with GUI (calculator, todo list, game, etc). Generates code, tests it, fixes errors automatically.", "params": {"description": "str (what kind of app to create)", "app_name": "str (optional)"}},
-        
-        # Applications
-        {"name": "open_application", "description": "Open/launch an application", "params": {"app_name": "str"}},
-        {"name": "close_application", "description": "Close/exit an application", "params": {"app_name": "str"}},
-        
-        # File Operations
-        {"name": "open_file_explorer", "description": "Open file explorer/file manager", "params": {}},
-        # NOTE: create_folder, create_file, create_powerpoint_presentation, create_ai_news_file
-        # are intentionally NOT listed here — all file/document creation goes to GENERATE_CODE
-        # so the code generator handles any complexity of content creation.
-        
-        # System Operations
-        {"name": "take_screenshot", "description": "Take a screenshot", "params": {}},
-        {"name": "open_camera_app", "description": "Open camera app", "params": {}},
-        {"name": "lock_workstation", "description": "Lock the computer/screen", "params": {}},
-        {"name": "restart_explorer", "description": "Restart Windows Explorer", "params": {}},
-        {"name": "empty_recycle_bin", "description": "Empty the recycle bin", "params": {}},
-        {"name": "night_light_on", "description": "Turn on night light/blue light filter", "params": {}},
-        {"name": "night_light_off", "description": "Turn off night light", "params": {}},
-        {"name": "airplane_mode_on", "description": "Enable airplane mode", "params": {}},
-        {"name": "airplane_mode_off", "description": "Disable airplane mode", "params": {}},
-        {"name": "hide_desktop_icons", "description": "Hide desktop icons", "params": {}},
-        {"name": "show_desktop_icons", "description": "Show desktop icons", "params": {}},
-        {"name": "system_info", "description": "Show system info (battery, CPU, RAM)", "params": {}},
-        {"name": "shutdown_computer", "description": "Shutdown the computer", "params": {}},
-        {"name": "restart_computer", "description": "Restart/reboot the computer", "params": {}},
-        {"name": "sleep_computer", "description": "Put computer to sleep", "params": {}},
-        
-        # Calculator
-        {"name": "open_calculator", "description": "Open calculator app", "params": {}},
-        {"name": "calculate", "description": "Calculate a math expression", "params": {"expression": "str"}},
-        
-        # Clipboard
-        {"name": "copy_text", "description": "Copy text/selection", "params": {}},
-        {"name": "paste_text", "description": "Paste text", "params": {}},
-        
-        # Time/Date
-        {"name": "get_time", "description": "Get current time", "params": {}},
-        {"name": "get_date", "description": "Get current date", "params": {}},
-        
-        # Web/Search
-        {"name": "google_search", "description": "Search Google for something", "params": {"query": "str"}},
-        {"name": "open_website", "description": "Open a website URL", "params": {"url": "str"}},
-        
-        # Weather
-        {"name": "get_weather", "description": "Get weather information", "params": {"location": "str (optional)"}},
-        
-        # Timer/Reminder
-        {"name": "set_timer", "description": "Set a timer", "params": {"duration": "str", "unit": "str (minutes/hours/seconds)"}},
-        {"name": "set_reminder", "description": "Set a reminder", "params": {"message": "str"}},
-        
-        # Media Control
-        {"name": "play_media", "description": "Resume/play currently paused media (press play button)", "params": {}},
-        {"name": "pause_media", "description": "Pause currently playing media", "params": {}},
-        {"name": "stop_media", "description": "Stop media playback", "params": {}},
-        {"name": "next_track", "description": "Skip to next track/song", "params": {}},
-        {"name": "previous_track", "description": "Go to previous track/song", "params": {}},
-        
-        # News (browser open - kept)
-        {"name": "get_news", "description": "Open Google News in browser to see latest headlines", "params": {}},
-        # NOTE: create_powerpoint_presentation and create_ai_news_file intentionally removed
-        # — all document/file creation goes to GENERATE_CODE for full LLM power.
-
-        # Terminal
-        {"name": "run_terminal_command", "description": "Run a terminal/command line command", "params": {"command": "str"}},
-        {"name": "open_terminal", "description": "Open terminal/PowerShell/CMD", "params": {}},
-        
-        # Keyboard
-        {"name": "type_text", "description": "Type text", "params": {"text": "str"}},
-        {"name": "press_key", "description": "Press a keyboard key", "params": {"key": "str"}},
-        {"name": "hotkey", "description": "Press keyboard shortcut/hotkey", "params": {"keys": "str"}},
-        
-        # Mouse
-        {"name": "mouse_click", "description": "Click mouse at position", "params": {"x": "int (optional)", "y": "int (optional)"}},
-        {"name": "right_click", "description": "Right click", "params": {}},
-        {"name": "double_click", "description": "Double click", "params": {}},
-        {"name": "scroll", "description": "Scroll up or down", "params": {"clicks": "int (positive=up, negative=down)"}},
-        
-        # Window Management
-        {"name": "minimize_all_windows", "description": "Minimize all windows/show desktop", "params": {}},
-        {"name": "switch_window", "description": "Switch to next window (Alt+Tab)", "params": {}},
-        {"name": "close_window", "description": "Close current window", "params": {}},
-        {"name": "maximize_window", "description": "Maximize current window", "params": {}},
-        {"name": "snap_window_left", "description": "Snap window to left half", "params": {}},
-        {"name": "snap_window_right", "description": "Snap window to right half", "params": {}},
-        
-        # Git
-        {"name": "git_status", "description": "Show git status", "params": {}},
-        {"name": "git_pull", "description": "Git pull latest changes", "params": {}},
-        {"name": "git_commit", "description": "Git commit with message", "params": {"message": "str"}},
-        {"name": "git_push", "description": "Git push changes", "params": {}},
-        
-        # WhatsApp
-        {"name": "open_whatsapp", "description": "Open WhatsApp", "params": {}},
-        {"name": "whatsapp_send_message", "description": "Send WhatsApp message", "params": {"contact": "str", "message": "str"}},
-        
-        # Screen Recording
-        {"name": "start_screen_recording", "description": "Start screen recording", "params": {}},
-        {"name": "stop_screen_recording", "description": "Stop screen recording", "params": {}},
-        
-        # Browser Control
-        {"name": "browser_task", "description": "Automate a complex browser task using AI (fill forms, extract info from websites, book tickets, interact with web pages, scrape data, do multi-step web workflows)", "params": {"task": "str (what to do in the browser)", "url": "str (optional starting URL)"}},
-        {"name": "browser_new_tab", "description": "Open new browser tab", "params": {}},
-        {"name": "browser_close_tab", "description": "Close current browser tab", "params": {}},
-        {"name": "browser_refresh", "description": "Refresh/reload page", "params": {}},
-        {"name": "browser_back", "description": "Go back in browser", "params": {}},
-        {"name": "browser_forward", "description": "Go forward in browser", "params": {}},
-        
-        # Telegram Bot
-        {"name": "start_telegram_bot", "description": "Start the Telegram bot for remote control", "params": {}},
-        {"name": "stop_telegram_bot", "description": "Stop the Telegram bot", "params": {}},
-        {"name": "send_telegram_message", "description": "Send a message to the user via Telegram", "params": {"text": "str (message to send)"}},
-        {"name": "send_telegram_file", "description": "Send a file to the user via Telegram", "params": {"file_path": "str (path to file)", "caption": "str (optional)"}},
-        {"name": "send_telegram_photo", "description": "Send a photo/image via Telegram", "params": {"photo_path": "str (path to image)", "caption": "str (optional)"}},
-        
-        # Shortcuts
-        {"name": "select_all", "description": "Select all (Ctrl+A)", "params": {}},
-        {"name": "undo", "description": "Undo (Ctrl+Z)", "params": {}},
-        {"name": "redo", "description": "Redo (Ctrl+Y)", "params": {}},
-        {"name": "save", "description": "Save file (Ctrl+S)", "params": {}},
-        {"name": "find", "description": "Find in page", "params": {"query": "str"}},
-    ]
-    
-    def __init__(self):
-        self._tools_prompt = self._build_tools_prompt()
+    # Kept as a class attribute for callers that reach the tool list
+    # through the router instance.
+    KNOWN_TOOLS = KNOWN_TOOLS
 
+    def __init__(self):
         # --- Intent Router uses its own dedicated API key ---
         # Set GEMINI_API_KEY_INTENT in .env to isolate its quota.
         # Falls back to the shared GEMINI_API_KEY if not set.
@@ -216,39 +438,62 @@ class IntentRouter:
             logging.error("[IntentRouter] No API key — set GEMINI_API_KEY_INTENT or GEMINI_API_KEY in .env")
 
         self._model = "gemini-2.5-flash"
-        logging.info(f"LLM Intent Router initialized with {len(self.KNOWN_TOOLS)} tools")
-    
-    def _build_tools_prompt(self) -> str:
-        """Build the tools list for the LLM prompt"""
-        tools_text = []
-        for tool in self.KNOWN_TOOLS:
-            params_str = ", ".join([f"{k}: {v}" for k, v in tool["params"].items()]) if tool["params"] else "none"
-            tools_text.append(f"- {tool['name']}: {tool['description']} | params: {params_str}")
-        return "\n".join(tools_text)
-    
+
+        # Classification cache: voice commands are heavily repeated
+        # ("pause", "next track", "mute"), so an LRU of past LLM verdicts
+        # turns those repeats into dict hits instead of network calls.
+        # Entries expire after an hour in case tool behavior changes.
+        self._cache: "OrderedDict[str, Tuple[float, RouteResult]]" = OrderedDict()
+        self._cache_max = 2048
+        self._cache_ttl = 3600.0
+        self._cache_lock = threading.Lock()
+
+        # In-flight classifications keyed like the cache: when two threads
+        # (e.g. concurrent multi-task subtasks) ask about the same command,
+        # the second waits on the first's Future instead of hitting Gemini.
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Circuit breaker for sustained rate limiting: while the cooldown
+        # is active, classify() skips the LLM and falls straight through to
+        # code generation instead of piling blocked threads on a dead API.
+        self._cooldown_until = 0.0
+        self._recent_failures: deque = deque(maxlen=5)
+
+        logging.info(f"LLM Intent Router initialized with {len(KNOWN_TOOLS)} tools")
+
+    @functools.cached_property
+    def _tools_prompt(self) -> str:
+        """Tools prompt, built on the first LLM miss.
+
+        Direct-map hits, conversation short-circuits, and cache hits never
+        reference it, so those paths skip the build entirely.
+        """
+        return _tools_prompt_text()
+
+    # Questions that are NOT action requests, fused into one anchored
+    # alternation so the starter check is a single C-level match instead
+    # of ~17 Python-level startswith calls per command.
+    _CONV_RE = re.compile(
+        r"^(?:what is|what are|what's|who is|who are"
+        r"|why is|why are|how does|how do|can you explain"
+        r"|tell me about|explain|describe|teach me"
+        r"|compare|difference between|versus|vs)\b"
+    )
+    # Action-oriented questions that should still route to tools
+    _ACTION_EXC_RE = re.compile(r"what time|what date|what's the weather|what is the time")
+
     def _is_conversation(self, command: str) -> bool:
         """Quick check if this is clearly a conversation/question"""
         command_lower = command.lower().strip()
-        
-        # Questions that are NOT action requests
-        conversation_starters = [
-            "what is", "what are", "what's", "who is", "who are",
-            "why is", "why are", "how does", "how do", "can you explain",
-            "tell me about", "explain", "describe", "teach me",
-            "compare", "difference between", "versus", "vs"
-        ]
-        
-        for starter in conversation_starters:
-            if command_lower.startswith(starter):
-                # But exclude action-oriented questions
-                action_exceptions = ["what time", "what date", "what's the weather", "what is the time"]
-                if not any(exc in command_lower for exc in action_exceptions):
-                    return True
-        
+
+        if self._CONV_RE.match(command_lower) and not self._ACTION_EXC_RE.search(command_lower):
+            return True
+
         # Ends with ? and is clearly conversational
         if command_lower.endswith("?") and len(command_lower.split()) > 5:
             return True
-        
+
         return False
     
     def classify(self, command: str, context: Optional[Any] = None) -> RouteResult:
@@ -256,7 +501,21 @@ class IntentRouter:
         command_clean = command.strip()
         
         logging.info(f"LLM Intent Router classifying: '{command_clean}'")
-        
+
+        # Exact-match trivial commands skip the LLM entirely
+        direct = _DIRECT_MAP.get(command_clean.lower())
+        if direct is not None:
+            tool_name, params = direct
+            logging.info(f"[IntentRouter] Direct match: '{command_clean}' -> {tool_name}")
+            return RouteResult(
+                confidence=0.99,
+                function=tool_name,
+                args=dict(params),
+                match_type="direct",
+                match_quality=MatchQuality.EXACT,
+                raw_command=command_clean
+            )
+
         # Quick check for conversations
         if self._is_conversation(command_clean):
             logging.info("Detected conversation intent")
@@ -277,11 +536,31 @@ class IntentRouter:
                 needs_code_generation=True
             )
         
+        cache_key = command_clean.lower()
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logging.info(f"[IntentRouter] Cache hit: '{command_clean}'")
+            return dataclasses.replace(cached, raw_command=command_clean)
+
+        if time.monotonic() < self._cooldown_until:
+            logging.warning("[IntentRouter] In rate-limit cooldown, skipping LLM")
+            return RouteResult(
+                confidence=0.0,
+                match_type="none",
+                raw_command=command_clean,
+                needs_code_generation=True
+            )
+
         try:
-            result = self._classify_with_llm(command_clean)
+            result = self._classify_coalesced(cache_key, command_clean)
+            # Code-generation fallbacks are not cached - their handling may
+            # depend on params/context that vary between invocations.
+            if not result.needs_code_generation:
+                self._cache_put(cache_key, result)
             return result
         except Exception as e:
             logging.error(f"LLM classification error: {e}")
+            self._note_failure()
             return RouteResult(
                 confidence=0.0,
                 match_type="none",
@@ -289,35 +568,156 @@ class IntentRouter:
                 needs_code_generation=True
             )
     
-    def _classify_with_llm(self, command: str) -> RouteResult:
-        """Use LLM to classify the command"""
-        
-        prompt = f"""You are an intent classifier for a voice assistant. Given a user command, determine which tool to use.
+    def classify_many(self, commands: List[str]) -> List[RouteResult]:
+        """Classify several commands with at most one LLM call.
+
+        The tools list dominates the classification prompt, so sending N
+        subtask commands in a single prompt amortizes those tokens across
+        all of them - one round-trip instead of N. Conversation checks and
+        cache hits are resolved locally first; a failed batch call falls
+        back to classifying the remainder individually.
+        """
+        results: List[Optional[RouteResult]] = [None] * len(commands)
+        pending: List[Tuple[int, str]] = []
+
+        for i, command in enumerate(commands):
+            clean = command.strip()
+            direct = _DIRECT_MAP.get(clean.lower())
+            if direct is not None:
+                tool_name, params = direct
+                results[i] = RouteResult(
+                    confidence=0.99,
+                    function=tool_name,
+                    args=dict(params),
+                    match_type="direct",
+                    match_quality=MatchQuality.EXACT,
+                    raw_command=clean
+                )
+                continue
+            if self._is_conversation(clean):
+                results[i] = RouteResult(
+                    confidence=0.95,
+                    is_conversation=True,
+                    match_type="conversation",
+                    raw_command=clean
+                )
+                continue
+            cached = self._cache_get(clean.lower())
+            if cached is not None:
+                results[i] = dataclasses.replace(cached, raw_command=clean)
+                continue
+            pending.append((i, clean))
+
+        if len(pending) > 1 and self._client:
+            try:
+                batch = self._classify_batch_with_llm([c for _, c in pending])
+                for (i, clean), result in zip(pending, batch):
+                    if not result.needs_code_generation:
+                        self._cache_put(clean.lower(), result)
+                    results[i] = result
+                pending = []
+            except Exception as e:
+                logging.warning(f"[IntentRouter] Batch classification failed ({e}), classifying individually")
+
+        for i, clean in pending:
+            results[i] = self.classify(clean)
+        return results
 
-AVAILABLE TOOLS:
+    def _classify_batch_with_llm(self, commands: List[str]) -> List[RouteResult]:
+        """One LLM call classifying every command, returning results in order"""
+        numbered = "\n".join(f'{i + 1}. "{c}"' for i, c in enumerate(commands))
+        prompt = f"""You are an intent classifier for a voice assistant. Given user commands, determine which tool to use for each.
+
+AVAILABLE TOOLS (one JSON record per line; "n"=tool name, "p"=parameter names, "d"=description where the name is ambiguous):
 {self._tools_prompt}
 
-USER COMMAND: "{command}"
+USER COMMANDS:
+{numbered}
 
 INSTRUCTIONS:
-1. If the command matches one of the available tools, respond with the tool name and extracted parameters
-2. If the command is a general question or conversation, respond with "CONVERSATION"
+1. If a command matches one of the available tools, respond with the tool name and extracted parameters
+2. If a command is a general question or conversation, respond with "CONVERSATION"
 3. If no tool matches and it requires generating custom code, respond with "GENERATE_CODE"
 
-Respond ONLY with valid JSON in this exact format:
-{{"action": "TOOL" or "CONVERSATION" or "GENERATE_CODE", "tool_name": "tool_name_here or null", "params": {{"param_name": "value"}} or {{}}}}
+Respond ONLY with a valid JSON array containing exactly {len(commands)} objects, one per command, in the same order:
+[{{"action": "TOOL" or "CONVERSATION" or "GENERATE_CODE", "tool_name": "tool_name_here or null", "params": {{}}}}, ...]
 
-Examples:
-- "set volume to 50" -> {{"action": "TOOL", "tool_name": "set_system_volume", "params": {{"level": 50}}}}
-- "play despacito on youtube" -> {{"action": "TOOL", "tool_name": "play_youtube", "params": {{"query": "despacito"}}}}
-- "what is machine learning" -> {{"action": "CONVERSATION", "tool_name": null, "params": {{}}}}
-- "create a todo app with python" -> {{"action": "GENERATE_CODE", "tool_name": null, "params": {{}}}}
-- "go to github and find the most starred AI repo" -> {{"action": "TOOL", "tool_name": "browser_task", "params": {{"task": "find the most starred AI repo", "url": "https://github.com"}}}}
-- "fill out the contact form on example.com with fake data" -> {{"action": "TOOL", "tool_name": "browser_task", "params": {{"task": "fill out the contact form with fake data", "url": "https://example.com"}}}}
+JSON RESPONSE:"""
 
-IMPORTANT: Use "browser_task" when the user wants to interact with a website (read content, fill forms, click buttons, extract data, do multi-step web workflows). Use "open_website" or "google_search" only for simple navigation or search.
+        response = self._client.models.generate_content(
+            model=self._model,
+            contents=prompt
+        )
+        data = _parse_json_reply(response.text.strip(), _JSON_ARR_RE)
+        if not isinstance(data, list) or len(data) != len(commands):
+            raise ValueError(
+                f"expected {len(commands)} classifications, got "
+                f"{len(data) if isinstance(data, list) else type(data).__name__}"
+            )
+        return [self._result_from_entry(entry, command)
+                for entry, command in zip(data, commands)]
 
-JSON RESPONSE:"""
+    def _note_failure(self) -> None:
+        """Record an LLM failure; open the breaker on a burst of them."""
+        now = time.monotonic()
+        self._recent_failures.append(now)
+        if (len(self._recent_failures) == self._recent_failures.maxlen
+                and now - self._recent_failures[0] <= 30.0):
+            self._cooldown_until = max(self._cooldown_until, now + 30.0)
+            logging.warning("[IntentRouter] Repeated LLM failures, cooling down for 30s")
+
+    def _classify_coalesced(self, key: str, command: str) -> RouteResult:
+        """Classify via the LLM, collapsing concurrent duplicate requests.
+
+        The first caller for a key does the real work; later callers with
+        the same key block on its Future and share the result.
+        """
+        with self._inflight_lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = concurrent.futures.Future()
+                self._inflight[key] = fut
+
+        if not leader:
+            return dataclasses.replace(fut.result(timeout=30.0), raw_command=command)
+
+        try:
+            result = self._classify_with_llm(command)
+            fut.set_result(result)
+            return result
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _cache_get(self, key: str) -> Optional[RouteResult]:
+        """Return a cached RouteResult if present and fresh, else None."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stamp, result = entry
+            if time.monotonic() - stamp > self._cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key: str, result: RouteResult) -> None:
+        """Insert a classification, evicting the least recently used entry."""
+        with self._cache_lock:
+            if len(self._cache) >= self._cache_max:
+                self._cache.popitem(last=False)
+            self._cache[key] = (time.monotonic(), result)
+
+    def _classify_with_llm(self, command: str) -> RouteResult:
+        """Use LLM to classify the command"""
+        
+        prefix, suffix = _classify_prompt_parts()
+        prompt = prefix + command.replace('"', '\\"') + suffix
 
         # Call LLM with retry
         import time
@@ -341,8 +741,14 @@ JSON RESPONSE:"""
                 # Check for rate limit errors
                 if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "quota" in error_str.lower():
                     if attempt < max_retries - 1:
-                        wait_time = 2 ** (attempt + 1)  # 2, 4 seconds
-                        logging.warning(f"[IntentRouter] Rate limit hit, waiting {wait_time}s (retry {attempt + 2}/{max_retries})")
+                        # Full jitter: colliding clients wake up staggered
+                        # instead of re-stampeding the provider together.
+                        wait_time = random.uniform(0, 2 ** (attempt + 1))
+                        # Let other threads skip the LLM while we back off
+                        self._cooldown_until = max(
+                            self._cooldown_until, time.monotonic() + wait_time
+                        )
+                        logging.warning(f"[IntentRouter] Rate limit hit, waiting {wait_time:.1f}s (retry {attempt + 2}/{max_retries})")
                         time.sleep(wait_time)
                         continue
                 logging.error(f"[IntentRouter] Classification error: {e}")
@@ -353,53 +759,10 @@ JSON RESPONSE:"""
         
         # Parse JSON response
         try:
-            # Clean up response (remove markdown code blocks if present)
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-            response_text = response_text.strip()
-            
-            result = json.loads(response_text)
-            
-            action = result.get("action", "GENERATE_CODE")
-            tool_name = result.get("tool_name")
-            params = result.get("params", {})
-            
-            if action == "CONVERSATION":
-                return RouteResult(
-                    confidence=0.95,
-                    is_conversation=True,
-                    match_type="llm_conversation",
-                    raw_command=command
-                )
-            
-            if action == "TOOL" and tool_name:
-                # Validate tool exists
-                valid_tools = [t["name"] for t in self.KNOWN_TOOLS]
-                if tool_name in valid_tools:
-                    logging.info(f"LLM matched tool: {tool_name} with params: {params}")
-                    return RouteResult(
-                        confidence=0.90,
-                        function=tool_name,
-                        args=params,
-                        match_type="llm_tool",
-                        match_quality=MatchQuality.SPECIFIC,
-                        raw_command=command
-                    )
-                else:
-                    logging.warning(f"LLM suggested unknown tool: {tool_name}")
-            
-            # Fall back to code generation
-            logging.info("LLM suggests code generation")
-            return RouteResult(
-                confidence=0.0,
-                match_type="none",
-                raw_command=command,
-                needs_code_generation=True
-            )
-            
-        except json.JSONDecodeError as e:
+            result = _parse_json_reply(response_text)
+            return self._result_from_entry(result, command)
+
+        except ValueError as e:
             logging.error(f"Failed to parse LLM response as JSON: {e}")
             logging.error(f"Response was: {response_text}")
             return RouteResult(
@@ -409,6 +772,44 @@ JSON RESPONSE:"""
                 needs_code_generation=True
             )
 
+    def _result_from_entry(self, entry: Dict[str, Any], command: str) -> RouteResult:
+        """Turn one parsed classification object into a RouteResult"""
+        action = entry.get("action", "GENERATE_CODE")
+        tool_name = entry.get("tool_name")
+        params = entry.get("params", {})
+
+        if action == "CONVERSATION":
+            return RouteResult(
+                confidence=0.95,
+                is_conversation=True,
+                match_type="llm_conversation",
+                raw_command=command
+            )
+
+        if action == "TOOL" and tool_name:
+            # Validate tool exists
+            if tool_name in _TOOL_NAMES:
+                logging.info(f"LLM matched tool: {tool_name} with params: {params}")
+                return RouteResult(
+                    confidence=0.90,
+                    function=tool_name,
+                    args=params,
+                    match_type="llm_tool",
+                    match_quality=MatchQuality.SPECIFIC,
+                    raw_command=command
+                )
+            else:
+                logging.warning(f"LLM suggested unknown tool: {tool_name}")
+
+        # Fall back to code generation
+        logging.info("LLM suggests code generation")
+        return RouteResult(
+            confidence=0.0,
+            match_type="none",
+            raw_command=command,
+            needs_code_generation=True
+        )
+
 
 # Global instance
 _router_instance = None
@@ -7,13 +7,14 @@ Example: "close notepad and then open chrome and search for weather"
  → Dependencies: search depends on chrome being open
 """
 
+import asyncio
 import re
 import logging
 from typing import List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a single task extracted from a multi-task command"""
     command: str
@@ -22,6 +23,7 @@ class Task:
     executed: bool = False
     success: bool = False
     result: str = ""
+    route_result: Optional[Any] = None  # Pre-batched intent classification
 
 
 class MultiTaskHandler:
@@ -54,11 +56,32 @@ class MultiTaskHandler:
     PARALLEL_KEYWORDS = [
         'also', 'at the same time', 'simultaneously', 'as well'
     ]
-    
+
+    # All separators fused into one alternation, compiled once. The
+    # SEPARATORS list is ordered longest-first, so the alternation keeps
+    # that priority and a single split() pass replaces the old
+    # 8-patterns x N-parts loop that recompiled each pattern per call.
+    _SEP_RE = re.compile("|".join(f"(?:{p})" for p in SEPARATORS), re.IGNORECASE)
+    _DEP_RE = re.compile(r"\b(?:then|after that|next|afterwards|following that)\b", re.IGNORECASE)
+
+    # Tools whose duplicate subtasks may be coalesced: pure reads and
+    # captures with no cumulative effect. Anything else (volume steps,
+    # messages, app launches) executes once per occurrence.
+    _READ_ONLY_TOOLS = frozenset((
+        "take_screenshot", "system_info", "get_time", "get_date",
+        "get_weather", "calculate",
+    ))
+    _OPEN_RE = re.compile(r"\b(?:open|launch|start)\b")
+    _ACT_RE = re.compile(r"\b(?:search|type|click|find)\b")
+
     def __init__(self):
         self._intent_router = None
         self._goal_router = None
         self._bridge = None
+        # Drop repeated read-only subtasks within one command (usually
+        # split artifacts); side-effecting repeats always run. Set False
+        # to disable merging entirely.
+        self.dedup = True
         logging.info("MultiTaskHandler initialized")
     
     @property
@@ -85,6 +108,21 @@ class MultiTaskHandler:
             self._bridge = aura_bridge
         return self._bridge
     
+    def warmup(self) -> None:
+        """Eagerly resolve the lazy router/bridge imports.
+
+        Without this the first real command pays those imports (and the
+        routers' own initialization) mid-interaction. Meant to be called
+        from a background thread at startup; see aura_v2_bridge.
+        """
+        try:
+            _ = self.intent_router
+            _ = self.goal_router
+            _ = self.bridge
+            logging.info("MultiTaskHandler: warmup complete")
+        except Exception as e:
+            logging.warning(f"MultiTaskHandler: warmup failed: {e}")
+
     def is_multi_task(self, command: str) -> bool:
         """Check if command contains multiple tasks"""
         command_lower = command.lower()
@@ -117,11 +155,7 @@ class MultiTaskHandler:
                     return False
         
         # Check for separators
-        for pattern in self.SEPARATORS:
-            if re.search(pattern, command_lower):
-                return True
-        
-        return False
+        return self._SEP_RE.search(command_lower) is not None
     
     def split_tasks(self, command: str) -> List[Task]:
         """
@@ -176,109 +210,198 @@ JSON RESPONSE:"""
         except Exception as e:
             logging.warning(f"LLM task splitting failed: {e}, falling back to regex")
         
-        # Fallback to regex-based splitting
-        parts = [command]
-        original_command = command.lower()
-        
-        for pattern in self.SEPARATORS:
-            new_parts = []
-            for part in parts:
-                splits = re.split(pattern, part, flags=re.IGNORECASE)
-                if len(splits) > 1:
-                    new_parts.extend(splits)
-                else:
-                    new_parts.append(part)
-            parts = new_parts
-        
-        # Clean up parts
-        parts = [p.strip() for p in parts if p.strip()]
-        
+        # Fallback to regex-based splitting: one pass of the fused pattern
+        parts = [p.strip() for p in self._SEP_RE.split(command) if p and p.strip()]
+
         # Determine dependencies
-        has_sequential_keywords = any(kw in original_command for kw in self.DEPENDENCY_KEYWORDS)
-        
+        parts_lower = [p.lower() for p in parts]
+        has_sequential_keywords = self._DEP_RE.search(command.lower()) is not None
+
+        # Single forward pass: remember the most recent "open/launch/start"
+        # part so action parts can depend on it without re-scanning (and
+        # re-lowercasing) everything before them.
+        last_opener = -1
         for i, part in enumerate(parts):
             task = Task(
                 command=part,
                 index=i,
                 depends_on=[]
             )
-            
+
             if has_sequential_keywords and i > 0:
                 task.depends_on = [i - 1]
-            
-            # Special dependency detection
-            part_lower = part.lower()
-            if any(kw in part_lower for kw in ['search', 'type', 'click', 'find']):
-                for j in range(i - 1, -1, -1):
-                    prev = parts[j].lower()
-                    if any(kw in prev for kw in ['open', 'launch', 'start']):
-                        if j not in task.depends_on:
-                            task.depends_on.append(j)
-                        break
-            
+
+            # Action parts depend on the nearest preceding opener
+            if last_opener >= 0 and self._ACT_RE.search(parts_lower[i]):
+                if last_opener not in task.depends_on:
+                    task.depends_on.append(last_opener)
+
+            if self._OPEN_RE.search(parts_lower[i]):
+                last_opener = i
+
             tasks.append(task)
         
         logging.info(f"Regex split into {len(tasks)} tasks: {[t.command for t in tasks]}")
         return tasks
+
+    def _dedupe_tasks(self, tasks: List[Task]) -> List[Task]:
+        """Collapse duplicate read-only subtasks.
+
+        Duplicates are usually malformed splits ("what time is it, and
+        what time is it"); each one would execute again for the same
+        answer. Only tasks whose classified tool is in _READ_ONLY_TOOLS
+        are merged - repeating a side-effecting command ("turn the
+        volume up and turn the volume up") is meaningful and every
+        occurrence must run, as must anything unclassified. The first
+        occurrence is kept and later dependencies on a merged duplicate
+        are remapped to it.
+        """
+        seen: Dict[str, int] = {}
+        remap: Dict[int, int] = {}
+        kept: List[Task] = []
+
+        for task in tasks:
+            key = task.command.strip().lower()
+            if key in seen and self._is_read_only(task):
+                remap[task.index] = seen[key]
+                continue
+            new_index = len(kept)
+            remap[task.index] = new_index
+            seen[key] = new_index
+            task.index = new_index
+            kept.append(task)
+
+        if len(kept) == len(tasks):
+            return tasks
+
+        for task in kept:
+            task.depends_on = [remap[d] for d in task.depends_on
+                               if remap[d] != task.index]
+        logging.info(f"MultiTask: Dropped {len(tasks) - len(kept)} duplicate subtask(s)")
+        return kept
+
+    def _is_read_only(self, task: Task) -> bool:
+        """True when the task's classified tool has no side effects.
+
+        Unclassified tasks count as side-effecting so they are never
+        silently merged.
+        """
+        route = task.route_result
+        return route is not None and route.function in self._READ_ONLY_TOOLS
     
     def execute_tasks(self, tasks: List[Task]) -> Tuple[str, bool]:
         """
-        Execute tasks in order, respecting dependencies.
-        Returns combined result and overall success.
+        Execute tasks respecting dependencies, running independent tasks
+        concurrently.
+
+        Tasks are grouped into dependency levels: everything whose
+        dependencies are already satisfied forms a level, and a level's
+        tasks run in parallel on threads (each blocks on an LLM
+        classification, so the wall clock for a level is roughly its
+        slowest task, not the sum). Sequential chains ("then ...") still
+        execute strictly in order because each task sits in its own level.
         """
-        results = []
+        # Classify every subtask up front in one batched LLM call - the
+        # tools prompt is sent once instead of once per subtask. Execution
+        # below reuses the stashed result instead of re-classifying.
+        if len(tasks) > 1:
+            try:
+                routes = self.intent_router.classify_many([t.command for t in tasks])
+                for task, route in zip(tasks, routes):
+                    task.route_result = route
+            except Exception as e:
+                logging.warning(f"MultiTask: Batch classification failed: {e}")
+
+        # Dedup runs after classification so it can see each task's tool
+        # and only coalesce read-only ones.
+        if self.dedup and len(tasks) > 1:
+            tasks = self._dedupe_tasks(tasks)
+
+        results: List[str] = [""] * len(tasks)
         all_success = True
-        
-        for task in tasks:
-            # Check dependencies
-            deps_met = all(
-                tasks[dep].executed and tasks[dep].success 
-                for dep in task.depends_on
-            )
-            
-            if not deps_met:
+        remaining = list(tasks)
+        # Per-task status mask: 0 = pending, 1 = succeeded, 2 = failed.
+        # Dependency checks index this bytearray instead of re-reading
+        # two attributes off every prerequisite Task each round.
+        status = bytearray(len(tasks))
+
+        while remaining:
+            ready = [t for t in remaining
+                     if not any(status[d] == 0 for d in t.depends_on)]
+            if not ready:
+                # Shouldn't happen (split_tasks only emits backward deps),
+                # but force progress rather than loop forever.
+                ready = [remaining[0]]
+            remaining = [t for t in remaining if t not in ready]
+
+            runnable = []
+            for task in ready:
+                if not any(status[d] != 1 for d in task.depends_on):
+                    runnable.append(task)
+                    continue
                 task.result = f"Skipped (dependency failed): {task.command}"
                 task.executed = True
                 task.success = False
-                results.append(task.result)
+                status[task.index] = 2
+                results[task.index] = task.result
                 all_success = False
+
+            if len(runnable) == 1:
+                # Single task - no event loop overhead
+                task = runnable[0]
+                outcomes = [self._execute_single_task(task.command, task.route_result)]
+            elif runnable:
+                outcomes = asyncio.run(self._execute_level(runnable))
+            else:
                 continue
-            
-            # Execute through routing pipeline
-            response, success = self._execute_single_task(task.command)
-            
-            task.executed = True
-            task.success = success
-            task.result = response
-            results.append(response)
-            
-            if not success:
-                all_success = False
-        
-        # Combine results
+
+            for task, (response, success) in zip(runnable, outcomes):
+                task.executed = True
+                task.success = success
+                task.result = response
+                status[task.index] = 1 if success else 2
+                results[task.index] = response
+                if not success:
+                    all_success = False
+
+        # Combine results in original task order
         combined = "\n".join([r for r in results if r])
         return combined, all_success
+
+    async def _execute_level(self, level: List[Task]) -> List[Tuple[str, bool]]:
+        """Run one dependency level's tasks concurrently on threads."""
+        return await asyncio.gather(
+            *[asyncio.to_thread(self._execute_single_task, t.command, t.route_result)
+              for t in level]
+        )
     
-    def _execute_single_task(self, command: str) -> Tuple[str, bool]:
+    def _execute_single_task(self, command: str,
+                             route_result=None) -> Tuple[str, bool]:
         """
         Execute a single task through the routing pipeline:
         1. Intent Router (high confidence) → Function Executor
         2. Goal Router → Strategy Executor
         3. LLM Code Generation (fallback)
+
+        A pre-batched classification can be passed in via route_result
+        to skip the per-task classify call.
         """
         logging.info(f"MultiTask: Executing '{command}'")
-        
-        # Step 1: Try Intent Router
-        route_result = self.intent_router.classify(command)
-        
+
+        # Step 1: Try Intent Router (unless already classified in batch)
+        if route_result is None:
+            route_result = self.intent_router.classify(command)
+
+        intent_tried = False
         if route_result.function and route_result.confidence >= 0.70:
             logging.info(f"MultiTask: Intent matched '{route_result.function}' ({route_result.confidence:.2f})")
-            
+
             # Execute via bridge's local executor
+            intent_tried = True
             result = self.bridge._execute_local(route_result)
             if result[1]:  # success
                 return result[0], True
-        
+
         # Step 2: Try Goal Router
         if self.goal_router:
             try:
@@ -288,9 +411,10 @@ JSON RESPONSE:"""
                     return response, True
             except Exception as e:
                 logging.warning(f"MultiTask: Goal router error: {e}")
-        
-        # Step 3: Try lower confidence Intent Router match
-        if route_result.function and route_result.confidence >= 0.50:
+
+        # Step 3: Try lower confidence Intent Router match - but only if
+        # step 1 didn't already run this exact route_result and fail
+        if not intent_tried and route_result.function and route_result.confidence >= 0.50:
             result = self.bridge._execute_local(route_result)
             if result[1]:
                 return result[0], True
@@ -312,9 +436,9 @@ JSON RESPONSE:"""
         
         logging.info(f"MultiTask: Processing multi-task command")
         
-        # Split into tasks
+        # Split into tasks. Dedup happens inside execute_tasks, after
+        # batch classification, so it can gate on each task's tool.
         tasks = self.split_tasks(command)
-        
         if len(tasks) <= 1:
             # Couldn't split - let normal processing handle it
             return None, False, False
@@ -5,33 +5,57 @@ No intelligence here - just deterministic execution.
 """
 
 import logging
+import os
+import threading
 import time
 from typing import Optional, Callable
 from goal import HumanActionPlan, ActionStep
 
+# Imported eagerly so the module is already in sys.modules before the
+# first voice command arrives, rather than on first PlanExecutor
+# construction while the user is waiting.
+try:
+    import advanced_control
+except ImportError as e:
+    advanced_control = None
+    logging.error(f"Plan Executor: Could not load advanced_control: {e}")
+
 
 class PlanExecutor:
     """
     Executes HumanActionPlan step by step.
     Uses advanced_control.py for actual keyboard/mouse actions.
     """
-    
+
     def __init__(self):
-        self._advanced_control = None
-        self._load_control()
+        self._advanced_control = advanced_control
         self.interrupt_flag = False
+        # Pre-bound control functions: step handlers hit these with one
+        # attribute load instead of going through the module each time.
+        if advanced_control is not None:
+            self._press_key = advanced_control.press_key
+            self._hotkey = advanced_control.hotkey
+            self._type_text = advanced_control.type_text
+            self._mouse_click = advanced_control.mouse_click
+            self._scroll = advanced_control.scroll
+            self._copy_to_clipboard = advanced_control.copy_to_clipboard
+            self._paste_clipboard = advanced_control.paste_clipboard
+        # Step dispatch: one dict lookup instead of an if/elif ladder of
+        # string compares per step.
+        self._handlers = {
+            "KEY": self._do_key,
+            "KEY_REPEAT": self._do_key_repeat,
+            "HOTKEY": self._do_hotkey,
+            "TYPE": self._do_type,
+            "PASTE": self._do_paste,
+            "SHELL_OPEN": self._do_shell_open,
+            "WAIT": self._do_wait,
+            "CLICK": self._do_click,
+            "SCROLL": self._do_scroll,
+        }
         logging.info("Plan Executor initialized")
     
-    def _load_control(self):
-        """Load advanced_control module"""
-        try:
-            import advanced_control
-            self._advanced_control = advanced_control
-            logging.info("Plan Executor: Loaded advanced_control")
-        except ImportError as e:
-            logging.error(f"Plan Executor: Could not load advanced_control: {e}")
-    
-    def execute(self, plan: HumanActionPlan, 
+    def execute(self, plan: HumanActionPlan,
                 on_step: Optional[Callable[[int, ActionStep], None]] = None) -> bool:
         """
         Execute a human action plan.
@@ -47,89 +71,124 @@ class PlanExecutor:
             logging.error("No advanced_control module available")
             return False
         
-        self.interrupt_flag = False
-        total_steps = len(plan.steps)
-        
-        logging.info(f"Executing plan: {plan.description} ({total_steps} steps)")
-        
-        for i, step in enumerate(plan.steps):
+        self.reset()
+        total_steps = len(plan)
+
+        logging.info("Executing plan: %s (%d steps)", plan.description, total_steps)
+
+        # Walk the tagged arrays directly - no ActionStep objects are
+        # materialized unless a progress callback wants one. Dispatch is
+        # inlined here (rather than bouncing through _execute_step) so
+        # the steady-state cost per step is one dict lookup plus the
+        # handler call; on CPython 3.11+ the try block itself is free
+        # unless a step actually raises.
+        handlers = self._handlers
+        for i, (step_type, args) in enumerate(zip(plan.step_types, plan.step_args)):
             # Check for interrupt
             if self.interrupt_flag:
-                logging.info(f"Plan interrupted at step {i+1}/{total_steps}")
+                logging.info("Plan interrupted at step %d/%d", i + 1, total_steps)
                 return False
-            
+
             # Progress callback
             if on_step:
-                on_step(i, step)
-            
-            # Execute the step
-            success = self._execute_step(step)
-            if not success:
-                logging.warning(f"Step {i+1} failed: {step}")
-                # Continue anyway - some failures are recoverable
-        
-        logging.info(f"Plan completed: {plan.description}")
+                on_step(i, plan._make_step(i))
+
+            # Execute the step; continue anyway on failure - some
+            # failures are recoverable
+            handler = handlers.get(step_type)
+            if handler is None:
+                logging.warning("Unknown step type: %s", step_type)
+                continue
+            try:
+                handler(args)
+            except Exception as e:
+                logging.warning("Step %d failed: %s %s: %s", i + 1, step_type, args, e)
+
+        logging.info("Plan completed: %s", plan.description)
         return True
-    
-    def _execute_step(self, step: ActionStep) -> bool:
+
+    def _execute_step(self, step_type: str, args: tuple) -> bool:
         """Execute a single action step"""
+        handler = self._handlers.get(step_type)
+        if handler is None:
+            logging.warning("Unknown step type: %s", step_type)
+            return False
         try:
-            ac = self._advanced_control
-            
-            if step.type == "KEY":
-                # Single key press
-                for key in step.keys:
-                    ac.press_key(key)
-                return True
-            
-            elif step.type == "HOTKEY":
-                # Key combination
-                ac.hotkey(*step.keys)
-                return True
-            
-            elif step.type == "TYPE":
-                # Type text
-                ac.type_text(step.text)
-                return True
-            
-            elif step.type == "WAIT":
-                # Wait
-                time.sleep(step.ms / 1000.0)
-                return True
-            
-            elif step.type == "CLICK":
-                # Mouse click
-                ac.mouse_click(step.x, step.y, step.button)
-                return True
-            
-            elif step.type == "SCROLL":
-                # Scroll
-                ac.scroll(step.clicks)
-                return True
-            
-            else:
-                logging.warning(f"Unknown step type: {step.type}")
-                return False
-                
+            handler(args)
+            return True
         except Exception as e:
-            logging.error(f"Error executing step {step}: {e}")
+            logging.error("Error executing step %s %s: %s", step_type, args, e)
             return False
+
+    def _do_key(self, args: tuple):
+        press_key = self._press_key
+        for key in args:
+            press_key(key)
+
+    def _do_key_repeat(self, args: tuple):
+        key, count = args
+        press_key = self._press_key
+        for _ in range(count):
+            press_key(key)
+
+    def _do_hotkey(self, args: tuple):
+        self._hotkey(*args)
+
+    def _do_type(self, args: tuple):
+        self._type_text(args[0])
+
+    def _do_paste(self, args: tuple):
+        # Clipboard + ctrl+v: one event instead of a keystroke per
+        # character. Falls back to typing if the clipboard is unavailable.
+        if self._copy_to_clipboard(args[0]):
+            self._paste_clipboard()
+        else:
+            self._type_text(args[0])
+
+    def _do_shell_open(self, args: tuple):
+        # ShellExecute via os.startfile: the default browser opens the
+        # URL directly - no Start Menu scripting, no focus race.
+        os.startfile(args[0])
+
+    def _do_wait(self, args: tuple):
+        # Sleep in short slices so an interrupt() during a long wait
+        # (e.g. 3s for an app launch) is honored within ~20ms instead of
+        # only after the full sleep; the loop then stops at the next
+        # interrupt check.
+        deadline = time.monotonic() + args[0] / 1000.0
+        while not self.interrupt_flag:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 0.02))
+
+    def _do_click(self, args: tuple):
+        self._mouse_click(*args)
+
+    def _do_scroll(self, args: tuple):
+        self._scroll(args[0])
     
+    def reset(self):
+        """Clear the interrupt flag for a fresh execution"""
+        self.interrupt_flag = False
+
     def interrupt(self):
         """Set interrupt flag to stop execution"""
         self.interrupt_flag = True
         logging.info("Interrupt requested")
 
 
-# Global instance
-_executor_instance = None
+# One executor per thread: concurrent plan executions (e.g. parallel
+# multi-task levels) must not share interrupt_flag, which a single
+# global instance would race on.
+_executor_local = threading.local()
 
 def get_plan_executor() -> PlanExecutor:
-    """Get the global plan executor"""
-    global _executor_instance
-    if _executor_instance is None:
-        _executor_instance = PlanExecutor()
-    return _executor_instance
+    """Get this thread's plan executor, creating it lazily"""
+    executor = getattr(_executor_local, "executor", None)
+    if executor is None:
+        executor = _executor_local.executor = PlanExecutor()
+    return executor
 
 
 def execute_plan(plan: HumanActionPlan) -> bool:
@@ -5,15 +5,64 @@ Human reasoning layer: Given a Goal + Context, decide how to achieve it.
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from collections import defaultdict
+from typing import Callable, Optional, List, Dict, Any, Tuple
 
 from goal import Goal, GoalType, HumanActionPlan, ActionStep
 from context_engine import ContextEngine, get_context_engine
 
 
+def _frozen_steps(build: Callable[[HumanActionPlan], None]) -> Tuple[tuple, tuple]:
+    """Run a plan-building function once and freeze its step columns.
+
+    Most strategies emit the same step sequence on every call; freezing
+    the (step_types, step_args) columns at import means plan() splices
+    precomputed tuples instead of re-running a dozen add_step calls.
+    """
+    plan = HumanActionPlan()
+    build(plan)
+    return tuple(plan.step_types), tuple(plan.step_args)
+
+
+def _extend_plan(plan: HumanActionPlan,
+                 step_types: tuple, step_args: tuple) -> HumanActionPlan:
+    """Splice frozen step columns into a plan."""
+    # Merge a WAIT/WAIT seam the same way add_step coalesces waits.
+    if step_types and step_types[0] == "WAIT" \
+            and plan.step_types and plan.step_types[-1] == "WAIT":
+        plan.step_args[-1] = (plan.step_args[-1][0] + step_args[0][0],)
+        step_types = step_types[1:]
+        step_args = step_args[1:]
+    plan.step_types.extend(step_types)
+    plan.step_args.extend(step_args)
+    return plan
+
+
+def _build_focus_search(p: HumanActionPlan) -> None:
+    p.hotkey("ctrl", "l")
+    p.wait(200)
+
+
+# Focus the search box of an app that honors ctrl+l (e.g. Spotify)
+_FOCUS_SEARCH = _frozen_steps(_build_focus_search)
+
+
 class Strategy(ABC):
     """Base class for all strategies"""
-    
+
+    # Goal types this strategy can handle; used by StrategyPlanner to
+    # dispatch directly instead of probing every strategy per goal.
+    HANDLES: Tuple[GoalType, ...] = ()
+
+    # True when applicable() checks nothing beyond goal.type, which the
+    # dispatch table already guarantees — the planner skips the probe.
+    TYPE_ONLY = False
+
+    # Preference strings (lowercase) that select this strategy outright
+    # for its goal types, e.g. "spotify". The planner folds these into an
+    # exact-match (GoalType, pref) table checked before probing.
+    PREFS: Tuple[str, ...] = ()
+
     @abstractmethod
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         """Check if this strategy can handle the goal"""
@@ -31,7 +80,9 @@ class Strategy(ABC):
 
 class MediaKeyStrategy(Strategy):
     """Use OS-level media keys for play/pause/next/prev"""
-    
+
+    HANDLES = (GoalType.CONTROL_MEDIA,)
+
     MEDIA_ACTIONS = {
         "play": "playpause",
         "pause": "playpause",
@@ -42,30 +93,59 @@ class MediaKeyStrategy(Strategy):
         "stop": "stop",
         "mute": "volumemute",
     }
-    
+
+    # One frozen single-KEY template per action
+    _TEMPLATES = {
+        action: (("KEY",), ((media_key,),))
+        for action, media_key in MEDIA_ACTIONS.items()
+    }
+
+    # Membership-only checks go against the frozenset; goal.action_lc is
+    # interned, so the comparison is pointer equality.
+    _ACTION_SET = frozenset(MEDIA_ACTIONS)
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         if goal.type != GoalType.CONTROL_MEDIA:
             return False
-        action = goal.modifiers.get("action", "")
-        return action.lower() in self.MEDIA_ACTIONS
-    
+        return goal.action_lc in self._ACTION_SET
+
     def plan(self, goal: Goal, context: ContextEngine) -> HumanActionPlan:
-        action = goal.modifiers.get("action", "play_pause").lower()
-        media_key = self.MEDIA_ACTIONS.get(action, "playpause")
-        
+        action = goal.action_lc or "play_pause"
+        template = self._TEMPLATES.get(action, self._TEMPLATES["play_pause"])
+
         plan = HumanActionPlan(description=f"Media control: {action}")
-        plan.key(media_key)
-        return plan
+        return _extend_plan(plan, *template)
 
 
 class SpotifyStrategy(Strategy):
     """Open Spotify and play content"""
-    
+
+    HANDLES = (GoalType.PLAY_MEDIA,)
+    PREFS = ("spotify",)
+
+    def _build_open(p: HumanActionPlan) -> None:
+        p.hotkey("win")
+        p.wait(300)
+        p.type_text("spotify")
+        p.wait(200)
+        p.key("enter")
+        p.wait(3000)  # Wait for Spotify to open
+
+    def _build_search_tail(p: HumanActionPlan) -> None:
+        p.wait(300)
+        p.key("enter")
+        p.wait(1000)
+        p.key("enter")  # Play first result
+
+    # Frozen segments; only the TYPE(content) step varies per call
+    _OPEN_STEPS = _frozen_steps(_build_open)
+    _SEARCH_TAIL = _frozen_steps(_build_search_tail)
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         if goal.type != GoalType.PLAY_MEDIA:
             return False
         # Use Spotify if explicitly requested or it's the preferred music app
-        pref = goal.preference.lower()
+        pref = goal.pref_lc
         if pref == "spotify":
             return True
         if not pref and context.get_preference("music") == "spotify":
@@ -77,42 +157,36 @@ class SpotifyStrategy(Strategy):
             description=f"Play '{goal.content}' on Spotify",
             goal=goal
         )
-        
+
         # Open Spotify via Start Menu
-        plan.hotkey("win")
-        plan.wait(300)
-        plan.type_text("spotify")
-        plan.wait(200)
-        plan.key("enter")
-        plan.wait(3000)  # Wait for Spotify to open
-        
+        _extend_plan(plan, *self._OPEN_STEPS)
+
         if goal.content:
             # Search for content
-            plan.hotkey("ctrl", "l")  # Focus search
-            plan.wait(200)
+            _extend_plan(plan, *_FOCUS_SEARCH)
             plan.type_text(goal.content)
-            plan.wait(300)
-            plan.key("enter")
-            plan.wait(1000)
-            plan.key("enter")  # Play first result
-        
+            _extend_plan(plan, *self._SEARCH_TAIL)
+
         # Update context
         context.update_preference("music", "spotify")
-        
+
         return plan
 
 
 class YouTubeStrategy(Strategy):
     """Open YouTube and play/search content"""
-    
+
+    HANDLES = (GoalType.PLAY_MEDIA,)
+    PREFS = ("youtube", "yt")
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         if goal.type != GoalType.PLAY_MEDIA:
             return False
-        pref = goal.preference.lower()
+        pref = goal.pref_lc
         if pref in ["youtube", "yt"]:
             return True
         # Use YouTube for video content
-        if "video" in goal.modifiers.get("type", ""):
+        if "video" in goal.modifier("type", ""):
             return True
         return False
     
@@ -121,70 +195,44 @@ class YouTubeStrategy(Strategy):
             description=f"Play '{goal.content}' on YouTube",
             goal=goal
         )
-        
-        # Open browser and go to YouTube
-        plan.hotkey("win")
-        plan.wait(300)
-        plan.type_text("chrome")
-        plan.wait(200)
-        plan.key("enter")
-        plan.wait(2000)
-        
-        # Navigate to YouTube search
-        plan.hotkey("ctrl", "l")
-        plan.wait(200)
-        
-        if goal.content:
-            plan.type_text(f"youtube.com/results?search_query={goal.content.replace(' ', '+')}")
-        else:
-            plan.type_text("youtube.com")
-        
-        plan.key("enter")
-        plan.wait(2000)
-        
+
+        # One shell open instead of scripting the browser launch
         if goal.content:
+            plan.shell_open(f"https://youtube.com/results?search_query={goal.content.replace(' ', '+')}")
+            plan.wait(2000)
             # Click first video result
             plan.key("tab")
             plan.wait(200)
             plan.key("enter")
-        
+        else:
+            plan.shell_open("https://youtube.com")
+
         context.update_preference("video", "youtube")
         return plan
 
 
 class NetflixStrategy(Strategy):
     """Open Netflix and search for content"""
-    
+
+    HANDLES = (GoalType.PLAY_MEDIA,)
+    PREFS = ("netflix",)
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         if goal.type != GoalType.PLAY_MEDIA:
             return False
-        pref = goal.preference.lower()
-        return pref == "netflix"
+        return goal.pref_lc == "netflix"
     
     def plan(self, goal: Goal, context: ContextEngine) -> HumanActionPlan:
         plan = HumanActionPlan(
             description=f"Play '{goal.content}' on Netflix",
             goal=goal
         )
-        
-        # Open browser and go to Netflix
-        plan.hotkey("win")
-        plan.wait(300)
-        plan.type_text("chrome")
-        plan.wait(200)
-        plan.key("enter")
-        plan.wait(2000)
-        
-        plan.hotkey("ctrl", "l")
-        plan.wait(200)
-        
+
         if goal.content:
-            plan.type_text(f"netflix.com/search?q={goal.content.replace(' ', '%20')}")
+            plan.shell_open(f"https://netflix.com/search?q={goal.content.replace(' ', '%20')}")
         else:
-            plan.type_text("netflix.com")
-        
-        plan.key("enter")
-        
+            plan.shell_open("https://netflix.com")
+
         return plan
 
 
@@ -194,11 +242,14 @@ class NetflixStrategy(Strategy):
 
 class GmailStrategy(Strategy):
     """Open Gmail"""
-    
+
+    HANDLES = (GoalType.CHECK_EMAIL, GoalType.SEND_EMAIL)
+    PREFS = ("gmail", "google")
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         if goal.type not in [GoalType.CHECK_EMAIL, GoalType.SEND_EMAIL]:
             return False
-        pref = goal.preference.lower()
+        pref = goal.pref_lc
         if pref in ["gmail", "google"]:
             return True
         if not pref and context.get_preference("email") == "gmail":
@@ -207,20 +258,8 @@ class GmailStrategy(Strategy):
     
     def plan(self, goal: Goal, context: ContextEngine) -> HumanActionPlan:
         plan = HumanActionPlan(description="Open Gmail", goal=goal)
-        
-        # Open browser and go to Gmail
-        plan.hotkey("win")
-        plan.wait(300)
-        plan.type_text("chrome")
-        plan.wait(200)
-        plan.key("enter")
-        plan.wait(2000)
-        
-        plan.hotkey("ctrl", "l")
-        plan.wait(200)
-        plan.type_text("mail.google.com")
-        plan.key("enter")
-        
+        plan.shell_open("https://mail.google.com")
+
         context.update_preference("email", "gmail")
         return plan
 
@@ -231,27 +270,27 @@ class GmailStrategy(Strategy):
 
 class VolumeStrategy(Strategy):
     """Control system volume"""
-    
+
+    HANDLES = (GoalType.SYSTEM_CONTROL,)
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         if goal.type != GoalType.SYSTEM_CONTROL:
             return False
-        control = goal.modifiers.get("control", "")
+        control = goal.modifier("control", "")
         return control in ["volume", "sound", "audio"]
     
     def plan(self, goal: Goal, context: ContextEngine) -> HumanActionPlan:
         plan = HumanActionPlan(description="Volume control", goal=goal)
         
-        action = goal.modifiers.get("action", "")
-        level = goal.modifiers.get("level")
+        action = goal.modifier("action", "")
+        level = goal.modifier("level")
         
         if action == "mute":
             plan.key("volumemute")
         elif action == "up":
-            for _ in range(5):
-                plan.key("volumeup")
+            plan.key_repeat("volumeup", 5)
         elif action == "down":
-            for _ in range(5):
-                plan.key("volumedown")
+            plan.key_repeat("volumedown", 5)
         elif level is not None:
             # Use nircmd or PowerShell for exact level
             pass
@@ -261,11 +300,13 @@ class VolumeStrategy(Strategy):
 
 class BrightnessStrategy(Strategy):
     """Control screen brightness"""
-    
+
+    HANDLES = (GoalType.SYSTEM_CONTROL,)
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         if goal.type != GoalType.SYSTEM_CONTROL:
             return False
-        control = goal.modifiers.get("control", "")
+        control = goal.modifier("control", "")
         return control in ["brightness", "screen"]
     
     def plan(self, goal: Goal, context: ContextEngine) -> HumanActionPlan:
@@ -281,33 +322,41 @@ class BrightnessStrategy(Strategy):
 
 class OpenAppStrategy(Strategy):
     """Open any application via Start Menu"""
-    
+
+    HANDLES = (GoalType.OPEN_APP,)
+    TYPE_ONLY = True
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         return goal.type == GoalType.OPEN_APP
     
+    _OPEN_PREFIX = _frozen_steps(lambda p: p.hotkey("win").wait(300))
+    _OPEN_SUFFIX = _frozen_steps(lambda p: p.wait(300).key("enter"))
+
     def plan(self, goal: Goal, context: ContextEngine) -> HumanActionPlan:
         app_name = goal.content or goal.preference
         plan = HumanActionPlan(description=f"Open {app_name}", goal=goal)
-        
-        plan.hotkey("win")
-        plan.wait(300)
+
+        _extend_plan(plan, *self._OPEN_PREFIX)
         plan.type_text(app_name)
-        plan.wait(300)
-        plan.key("enter")
-        
+        _extend_plan(plan, *self._OPEN_SUFFIX)
+
         return plan
 
 
 class CloseAppStrategy(Strategy):
     """Close application via Alt+F4"""
-    
+
+    HANDLES = (GoalType.CLOSE_APP,)
+    TYPE_ONLY = True
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         return goal.type == GoalType.CLOSE_APP
     
+    _CLOSE_STEPS = _frozen_steps(lambda p: p.hotkey("alt", "f4"))
+
     def plan(self, goal: Goal, context: ContextEngine) -> HumanActionPlan:
         plan = HumanActionPlan(description=f"Close {goal.content}", goal=goal)
-        plan.hotkey("alt", "f4")
-        return plan
+        return _extend_plan(plan, *self._CLOSE_STEPS)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -316,31 +365,25 @@ class CloseAppStrategy(Strategy):
 
 class WebSearchStrategy(Strategy):
     """Search the web"""
-    
+
+    HANDLES = (GoalType.WEB_SEARCH,)
+    TYPE_ONLY = True
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         return goal.type == GoalType.WEB_SEARCH
     
     def plan(self, goal: Goal, context: ContextEngine) -> HumanActionPlan:
         plan = HumanActionPlan(description=f"Search: {goal.content}", goal=goal)
-        
-        plan.hotkey("win")
-        plan.wait(300)
-        plan.type_text("chrome")
-        plan.wait(200)
-        plan.key("enter")
-        plan.wait(2000)
-        
-        plan.hotkey("ctrl", "l")
-        plan.wait(200)
-        plan.type_text(f"google.com/search?q={goal.content.replace(' ', '+')}")
-        plan.key("enter")
-        
+        plan.shell_open(f"https://google.com/search?q={goal.content.replace(' ', '+')}")
         return plan
 
 
 class OpenWebsiteStrategy(Strategy):
     """Open a specific website"""
-    
+
+    HANDLES = (GoalType.OPEN_WEBSITE,)
+    TYPE_ONLY = True
+
     def applicable(self, goal: Goal, context: ContextEngine) -> bool:
         return goal.type == GoalType.OPEN_WEBSITE
     
@@ -350,19 +393,7 @@ class OpenWebsiteStrategy(Strategy):
             url = "https://" + url
         
         plan = HumanActionPlan(description=f"Open {url}", goal=goal)
-        
-        plan.hotkey("win")
-        plan.wait(300)
-        plan.type_text("chrome")
-        plan.wait(200)
-        plan.key("enter")
-        plan.wait(2000)
-        
-        plan.hotkey("ctrl", "l")
-        plan.wait(200)
-        plan.type_text(url)
-        plan.key("enter")
-        
+        plan.shell_open(url)
         return plan
 
 
@@ -402,13 +433,30 @@ class StrategyPlanner:
             WebSearchStrategy(),
             OpenWebsiteStrategy(),
         ]
-        
+
+        # Dispatch table: only strategies registered for a goal's type are
+        # probed, preserving the priority order above within each type.
+        self._by_type: Dict[GoalType, List[Strategy]] = defaultdict(list)
+        # Exact matches: an explicit preference like "spotify" picks its
+        # strategy with one dict lookup, no applicable() probing at all.
+        self._exact_match: Dict[Tuple[GoalType, str], Strategy] = {}
+        for strategy in self.strategies:
+            for goal_type in strategy.HANDLES:
+                self._by_type[goal_type].append(strategy)
+                for pref in strategy.PREFS:
+                    self._exact_match.setdefault((goal_type, pref), strategy)
+
         logging.info(f"Strategy Planner initialized with {len(self.strategies)} strategies")
-    
+
     def plan(self, goal: Goal) -> Optional[HumanActionPlan]:
         """Find a strategy and create a plan for the goal"""
-        for strategy in self.strategies:
-            if strategy.applicable(goal, self.context):
+        strategy = self._exact_match.get((goal.type, goal.pref_lc))
+        if strategy is not None:
+            logging.info(f"Using strategy: {strategy.__class__.__name__}")
+            return strategy.plan(goal, self.context)
+
+        for strategy in self._by_type.get(goal.type, ()):
+            if strategy.TYPE_ONLY or strategy.applicable(goal, self.context):
                 logging.info(f"Using strategy: {strategy.__class__.__name__}")
                 return strategy.plan(goal, self.context)
         
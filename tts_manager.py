@@ -3,10 +3,15 @@ AURA TTS Manager v2 - Uses Windows SAPI directly for reliable TTS
 Avoids pyttsx3's threading issues
 """
 
-import queue
+import collections
+import hashlib
+import io
+import re
+import tempfile
 import threading
 import time
 import os
+import wave
 
 # Try Windows SAPI directly
 try:
@@ -23,7 +28,46 @@ try:
 except ImportError:
     PYTTSX3_AVAILABLE = False
 
-TTS_AVAILABLE = SAPI_AVAILABLE or PYTTSX3_AVAILABLE
+# Optional local neural TTS: piper's small quantized ONNX voices
+# synthesize several times faster than real time on CPU. Opt in with
+# AURA_TTS_ENGINE=piper and AURA_PIPER_MODEL pointing at a .onnx voice
+# (e.g. en_US-amy-low).
+try:
+    from piper import PiperVoice
+    PIPER_AVAILABLE = True
+except ImportError:
+    PIPER_AVAILABLE = False
+
+TTS_ENGINE = os.environ.get('AURA_TTS_ENGINE', 'sapi').lower()
+PIPER_MODEL = os.environ.get('AURA_PIPER_MODEL', '')
+
+TTS_AVAILABLE = SAPI_AVAILABLE or PYTTSX3_AVAILABLE or PIPER_AVAILABLE
+
+# WAV playback for the phrase cache (stdlib, Windows only)
+try:
+    import winsound
+    WINSOUND_AVAILABLE = True
+except ImportError:
+    WINSOUND_AVAILABLE = False
+
+# Short fixed phrases (wake acks, mode toggles) are synthesized to disk
+# once and replayed from file afterwards - playback costs tens of ms
+# versus a full synthesis pass per utterance.
+_PHRASE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'aura_tts_cache')
+_CANNED_PHRASES = (
+    "Yes?",
+    "Hands-free mode activated. Say Aura to wake me.",
+    "Hands-free mode deactivated.",
+)
+
+# Utterances queued ahead of the engine before drop-oldest kicks in
+_QUEUE_MAX = 8
+
+# SAPI voice-name matchers, compiled once at import: one regex scan per
+# voice during selection instead of building an indicator list and
+# substring-testing each entry.
+_FEMALE_VOICE_RE = re.compile(r'zira|helena|eva|female')
+_MALE_VOICE_RE = re.compile(r'david|mark|male')
 
 
 class TTSManager:
@@ -45,12 +89,29 @@ class TTSManager:
             return
             
         self._initialized = True
-        self._queue = queue.Queue()
+        # Single producer (callers of speak) / single consumer (engine
+        # thread) handoff: deque.append/popleft are atomic under the GIL,
+        # so speak() never takes a lock or contends with the engine
+        # thread - just an append plus an Event wakeup. Bounded: when the
+        # engine falls behind, the oldest queued utterance is dropped
+        # rather than ever blocking the caller (stale speech is worthless
+        # anyway by the time an 8-deep backlog clears).
+        self._queue = collections.deque(maxlen=_QUEUE_MAX)
+        self._dropped = 0
+        self._wakeup = threading.Event()
         self._running = True
         self._thread = None
         self._ready = threading.Event()
         self._current_speaker = None  # Track current speaker for interruption
         self._should_stop = False  # Flag to stop current speech
+        # Streamed-text coalescing (speak_streaming): fragments collect
+        # here until a sentence boundary or a short idle pause, so the
+        # engine speaks whole sentences instead of one utterance per
+        # LLM token.
+        self._stream_buffer = []
+        self._stream_timer = None
+        self._stream_lock = threading.Lock()
+        self._phrase_cache = {}  # text -> pre-rendered WAV path
         
         if TTS_AVAILABLE:
             self._start_engine_thread()
@@ -67,9 +128,20 @@ class TTSManager:
         
         speaker = None
         use_sapi = False
-        
+        piper_voice = None
+
+        # Piper first when explicitly requested - it needs winsound for
+        # playback since it only produces PCM
+        if TTS_ENGINE == 'piper' and PIPER_AVAILABLE and WINSOUND_AVAILABLE and PIPER_MODEL:
+            try:
+                piper_voice = PiperVoice.load(PIPER_MODEL)
+                print(f"[TTS] Piper engine initialized ({os.path.basename(PIPER_MODEL)})")
+            except Exception as e:
+                print(f"[TTS] Piper failed: {e}")
+                piper_voice = None
+
         # Try SAPI first (more reliable)
-        if SAPI_AVAILABLE:
+        if piper_voice is None and SAPI_AVAILABLE:
             try:
                 import pythoncom
                 pythoncom.CoInitialize()  # Initialize COM for this thread
@@ -79,17 +151,12 @@ class TTSManager:
                 # Set voice (female preferred)
                 voices = speaker.GetVoices()
                 voice_pref = os.environ.get('AURA_VOICE', 'female').lower()
-                
+                voice_re = _FEMALE_VOICE_RE if voice_pref == 'female' else _MALE_VOICE_RE
+
                 for i in range(voices.Count):
-                    voice_name = voices.Item(i).GetDescription().lower()
-                    if voice_pref == 'female':
-                        if any(x in voice_name for x in ['zira', 'helena', 'eva', 'female']):
-                            speaker.Voice = voices.Item(i)
-                            break
-                    else:
-                        if any(x in voice_name for x in ['david', 'mark', 'male']):
-                            speaker.Voice = voices.Item(i)
-                            break
+                    if voice_re.search(voices.Item(i).GetDescription().lower()):
+                        speaker.Voice = voices.Item(i)
+                        break
                 
                 speaker.Rate = 1  # -10 to 10
                 speaker.Volume = 100  # 0 to 100
@@ -101,7 +168,7 @@ class TTSManager:
                 speaker = None
         
         # Fallback to pyttsx3
-        if speaker is None and PYTTSX3_AVAILABLE:
+        if piper_voice is None and speaker is None and PYTTSX3_AVAILABLE:
             try:
                 speaker = pyttsx3.init()
                 speaker.setProperty('rate', 175)
@@ -111,34 +178,58 @@ class TTSManager:
                 print(f"[TTS] pyttsx3 failed: {e}")
                 speaker = None
         
-        if speaker is None:
+        if speaker is None and piper_voice is None:
             print("[TTS] No TTS engine available!")
             self._ready.set()
             return
-        
+
         print("[TTS] Engine ready")
         self._ready.set()
+
+        if speaker is not None:
+            self._prime_phrase_cache(speaker, use_sapi)
         
         while self._running:
             try:
-                text = self._queue.get(timeout=1.0)
-                
+                try:
+                    text = self._queue.popleft()
+                except IndexError:
+                    # Clear-then-recheck so an append that races with the
+                    # clear is never missed, then sleep until woken. No
+                    # poll timeout: speak() and stop() both set the event,
+                    # so idle costs nothing and shutdown wakes the thread
+                    # immediately instead of after up to a second.
+                    self._wakeup.clear()
+                    if not self._queue:
+                        self._wakeup.wait()
+                    continue
+
                 if text is None:
                     break
-                
+
                 # Check if we should stop before speaking
                 if self._should_stop:
                     self._should_stop = False
                     # Clear queue of pending messages
-                    try:
-                        while True:
-                            self._queue.get_nowait()
-                    except queue.Empty:
-                        pass
+                    self._queue.clear()
                     continue
                 
                 if text and text.strip():
                     print(f"[TTS] Speaking: {text[:40]}...")
+
+                    # Canned phrase already rendered? Play the WAV and
+                    # skip synthesis entirely.
+                    cached = self._phrase_cache.get(text)
+                    if cached and self._play_cached(cached):
+                        continue
+
+                    if piper_voice is not None:
+                        try:
+                            self._play_piper(piper_voice, text)
+                        except Exception as e:
+                            print(f"[TTS] Piper speak error: {e}")
+                        continue
+
                     self._current_speaker = speaker  # Track for interruption
                     try:
                         if use_sapi:
@@ -160,8 +251,6 @@ class TTSManager:
                     finally:
                         self._current_speaker = None
                     
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"[TTS] Loop error: {e}")
                 time.sleep(0.5)
@@ -177,12 +266,159 @@ class TTSManager:
             speaker.stop()
         
         print("[TTS] Engine stopped")
-    
+
+    def _render_phrase(self, speaker, use_sapi, text, path):
+        """Synthesize text to a WAV file with whichever engine is live"""
+        if use_sapi:
+            stream = win32com.client.Dispatch("SAPI.SpFileStream")
+            stream.Open(path, 3)  # 3 = SSFMCreateForWrite
+            speaker.AudioOutputStream = stream
+            try:
+                speaker.Speak(text)  # synchronous while rendering to file
+            finally:
+                stream.Close()
+                speaker.AudioOutputStream = None  # back to default device
+        else:
+            speaker.save_to_file(text, path)
+            speaker.runAndWait()
+
+    def _prime_phrase_cache(self, speaker, use_sapi):
+        """Render the canned phrases once so later plays hit the WAV cache.
+
+        Runs on the engine thread (COM affinity) right after init; files
+        persist in the temp dir, so across restarts this is just a stat.
+        """
+        if not WINSOUND_AVAILABLE:
+            return
+        try:
+            os.makedirs(_PHRASE_CACHE_DIR, exist_ok=True)
+            for text in _CANNED_PHRASES:
+                path = os.path.join(
+                    _PHRASE_CACHE_DIR,
+                    hashlib.sha1(text.encode('utf-8')).hexdigest() + '.wav')
+                if not os.path.exists(path):
+                    self._render_phrase(speaker, use_sapi, text, path)
+                self._phrase_cache[text] = path
+            print(f"[TTS] Cached {len(self._phrase_cache)} canned phrases")
+        except Exception as e:
+            print(f"[TTS] Phrase cache disabled: {e}")
+            self._phrase_cache.clear()
+
+    def _synth_piper(self, piper_voice, text):
+        """Stage 1: synthesize text to in-memory WAV bytes + duration"""
+        buf = io.BytesIO()
+        with wave.open(buf, 'wb') as wav_file:
+            piper_voice.synthesize(text, wav_file)
+        data = buf.getvalue()
+        with wave.open(io.BytesIO(data), 'rb') as f:
+            duration = f.getnframes() / float(f.getframerate())
+        return data, duration
+
+    def _play_piper(self, piper_voice, text):
+        """Two-stage pipeline: synthesize, then while each utterance
+        plays (async winsound), synthesize the next queued one - the
+        playback time of utterance N hides the synthesis of N+1, so
+        back-to-back sentences come out gap-free."""
+        pcm, duration = self._synth_piper(piper_voice, text)
+        while True:
+            winsound.PlaySound(pcm, winsound.SND_MEMORY | winsound.SND_ASYNC)
+            deadline = time.monotonic() + duration
+
+            # Stage 1 for the next utterance runs during playback
+            next_item = None
+            if not self._should_stop:
+                try:
+                    candidate = self._queue.popleft()
+                except IndexError:
+                    pass
+                else:
+                    if candidate is None:
+                        # Shutdown sentinel belongs to the main loop
+                        self._queue.appendleft(candidate)
+                    elif candidate.strip():
+                        try:
+                            next_item = self._synth_piper(piper_voice, candidate)
+                        except Exception as e:
+                            print(f"[TTS] Piper speak error: {e}")
+
+            while time.monotonic() < deadline:
+                if self._should_stop:
+                    winsound.PlaySound(None, winsound.SND_PURGE)
+                    return
+                time.sleep(0.05)
+
+            if next_item is None:
+                return
+            pcm, duration = next_item
+
+    def _play_cached(self, path) -> bool:
+        """Play a pre-rendered WAV; False falls back to live synthesis"""
+        try:
+            with wave.open(path, 'rb') as f:
+                duration = f.getnframes() / float(f.getframerate())
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            # Async play + short-slice wait keeps stop_speaking responsive
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                if self._should_stop:
+                    winsound.PlaySound(None, winsound.SND_PURGE)
+                    break
+                time.sleep(0.05)
+            return True
+        except Exception as e:
+            print(f"[TTS] Cached playback failed: {e}")
+            return False
+
     def speak(self, text: str):
-        """Queue text to be spoken"""
+        """Queue text to be spoken - wait-free append, no lock to contend on"""
         if TTS_AVAILABLE and text and text.strip():
-            self._queue.put(text)
+            if len(self._queue) == _QUEUE_MAX:
+                # append on a full deque(maxlen) evicts the oldest entry;
+                # count drops and log occasionally rather than per-event
+                self._dropped += 1
+                if self._dropped % 25 == 1:
+                    print(f"[TTS] Backlog full - {self._dropped} utterances dropped so far")
+            self._queue.append(text)
+            self._wakeup.set()
     
+    def speak_streaming(self, text: str, flush: bool = False):
+        """
+        Feed a streamed text fragment (e.g. an LLM token) to the TTS.
+
+        Fragments accumulate in a buffer that is only handed to the
+        engine when it ends with sentence punctuation or a newline, when
+        flush=True, or after a 120ms idle pause - one synthesis per
+        sentence instead of one per token, which keeps prosody smooth.
+        """
+        if not TTS_AVAILABLE:
+            return
+        with self._stream_lock:
+            if self._stream_timer is not None:
+                self._stream_timer.cancel()
+                self._stream_timer = None
+            if text:
+                self._stream_buffer.append(text)
+            joined = ''.join(self._stream_buffer)
+            if flush or joined.rstrip().endswith(('.', '!', '?')) or joined.endswith('\n'):
+                self._stream_buffer.clear()
+            else:
+                if joined:
+                    self._stream_timer = threading.Timer(0.12, self._flush_stream)
+                    self._stream_timer.daemon = True
+                    self._stream_timer.start()
+                return
+        if joined.strip():
+            self.speak(joined)
+
+    def _flush_stream(self):
+        """Idle-timer callback: speak whatever has accumulated"""
+        with self._stream_lock:
+            self._stream_timer = None
+            joined = ''.join(self._stream_buffer)
+            self._stream_buffer.clear()
+        if joined.strip():
+            self.speak(joined)
+
     def stop_speaking(self):
         """Stop current speech immediately"""
         self._should_stop = True
@@ -195,10 +431,18 @@ class TTSManager:
                 pass
     
     def stop(self):
-        """Stop the TTS engine"""
+        """Stop the TTS engine.
+
+        Shutdown is event-driven: the sentinel plus wakeup reaches an
+        idle engine thread immediately, so the join returns in
+        milliseconds - its timeout is only a bound for a thread stuck
+        mid-utterance.
+        """
+        self._flush_stream()  # Speak any buffered streamed text (best effort)
         self._running = False
         self._should_stop = True
-        self._queue.put(None)
+        self._queue.append(None)
+        self._wakeup.set()
         if self._thread:
             self._thread.join(timeout=2.0)
 
@@ -225,6 +469,11 @@ def stop_speaking():
     get_tts_manager().stop_speaking()
 
 
+def speak_streaming(text: str, flush: bool = False):
+    """Feed a streamed text fragment; spoken once a sentence completes"""
+    get_tts_manager().speak_streaming(text, flush=flush)
+
+
 def speak_chunked(text: str, max_chunk_words: int = 50):
     """
     Speak text in manageable chunks for interruptibility.
@@ -236,8 +485,7 @@ def speak_chunked(text: str, max_chunk_words: int = 50):
     """
     if not text:
         return
-    
-    import re
+
     tts = get_tts_manager()
     
     # Split by sentence-ending punctuation
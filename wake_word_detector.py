@@ -5,34 +5,31 @@ Enables true hands-free operation without any keyboard input.
 """
 
 import logging
+import queue
 import threading
 import time
+from importlib.util import find_spec
 from typing import Callable, Optional, List
 from dataclasses import dataclass
 
-# Try to import audio libraries
-try:
-    import pyaudio
-    PYAUDIO_AVAILABLE = True
-except ImportError:
-    PYAUDIO_AVAILABLE = False
+# Probe availability without importing - pyaudio initializes the PortAudio
+# backend (device probing) and openwakeword drags in onnxruntime, so the
+# real imports are deferred until a backend is actually used.
+PYAUDIO_AVAILABLE = find_spec("pyaudio") is not None
+if not PYAUDIO_AVAILABLE:
     logging.warning("pyaudio not available. Install with: pip install pyaudio")
 
-# Try to import OpenWakeWord (free, offline)
-try:
-    import openwakeword
-    from openwakeword.model import Model as OWWModel
-    OPENWAKEWORD_AVAILABLE = True
-except ImportError:
-    OPENWAKEWORD_AVAILABLE = False
+# Preferred capture backend: sounddevice delivers frames from PortAudio's
+# own callback thread instead of a blocking Python read loop, so capture
+# timing is immune to GIL jitter from the rest of the app.
+SOUNDDEVICE_AVAILABLE = find_spec("sounddevice") is not None
+
+OPENWAKEWORD_AVAILABLE = find_spec("openwakeword") is not None
+if not OPENWAKEWORD_AVAILABLE:
     logging.info("OpenWakeWord not available. Install with: pip install openwakeword")
 
-# Try to import Porcupine (free tier available)
-try:
-    import pvporcupine
-    PORCUPINE_AVAILABLE = True
-except ImportError:
-    PORCUPINE_AVAILABLE = False
+PORCUPINE_AVAILABLE = find_spec("pvporcupine") is not None
+if not PORCUPINE_AVAILABLE:
     logging.info("Porcupine not available. Install with: pip install pvporcupine")
 
 
@@ -84,6 +81,8 @@ class WakeWordDetector:
         
         if backend == "openwakeword" and OPENWAKEWORD_AVAILABLE:
             try:
+                import openwakeword
+                from openwakeword.model import Model as OWWModel
                 # Download models if needed
                 openwakeword.utils.download_models()
                 # Use the "hey jarvis" model as it's similar to "hey aura"
@@ -99,6 +98,7 @@ class WakeWordDetector:
         
         if backend == "porcupine" and PORCUPINE_AVAILABLE:
             try:
+                import pvporcupine
                 # Use built-in wake words (computer, jarvis, etc.)
                 self._backend = pvporcupine.create(
                     keywords=["computer", "jarvis"],
@@ -148,11 +148,73 @@ class WakeWordDetector:
     
     def _listen_loop(self):
         """Main listening loop for audio-based detection"""
-        if not PYAUDIO_AVAILABLE:
-            logging.error("PyAudio not available for wake word detection")
-            return
-        
+        if SOUNDDEVICE_AVAILABLE:
+            self._listen_loop_sounddevice()
+        elif PYAUDIO_AVAILABLE:
+            self._listen_loop_pyaudio()
+        else:
+            logging.error("No audio backend available for wake word detection")
+
+    def _process_frame(self, audio_data: bytes):
+        """Run one captured frame through the active detection backend"""
+        if self._backend_type == "openwakeword":
+            prediction = self._backend.predict(audio_data)
+            for model_name, scores in prediction.items():
+                if any(score > self.config.sensitivity for score in scores):
+                    logging.info(f"Wake word detected: {model_name}")
+                    if self._callback:
+                        self._callback()
+                    # Brief pause to avoid multiple triggers
+                    time.sleep(1.0)
+
+        elif self._backend_type == "porcupine":
+            import struct
+            pcm = struct.unpack_from("h" * self.frame_length, audio_data)
+            keyword_index = self._backend.process(pcm)
+            if keyword_index >= 0:
+                logging.info(f"Wake word detected (index: {keyword_index})")
+                if self._callback:
+                    self._callback()
+                time.sleep(1.0)
+
+    def _listen_loop_sounddevice(self):
+        """Capture via PortAudio's native callback thread.
+
+        The callback only copies the frame into a queue; detection runs
+        here, so a slow model never stalls capture and capture timing
+        never waits on the GIL-bound blocking read that pyaudio uses.
+        """
+        import sounddevice as sd
+        frames = queue.Queue()
+
+        def _on_audio(indata, frame_count, time_info, status):
+            frames.put(bytes(indata))
+
+        try:
+            with sd.RawInputStream(samplerate=self.sample_rate,
+                                   blocksize=self.frame_length,
+                                   dtype='int16', channels=1,
+                                   callback=_on_audio):
+                logging.info("WakeWordDetector: Audio stream opened (sounddevice)")
+
+                while not self._stop_event.is_set():
+                    try:
+                        audio_data = frames.get(timeout=0.5)
+                    except queue.Empty:
+                        continue
+                    try:
+                        self._process_frame(audio_data)
+                    except Exception as e:
+                        logging.error(f"Audio processing error: {e}")
+                        time.sleep(0.1)
+
+        except Exception as e:
+            logging.error(f"Wake word detection error: {e}")
+
+    def _listen_loop_pyaudio(self):
+        """Fallback capture: blocking pyaudio read loop"""
         try:
+            import pyaudio
             pa = pyaudio.PyAudio()
             stream = pa.open(
                 format=pyaudio.paInt16,
@@ -161,41 +223,21 @@ class WakeWordDetector:
                 input=True,
                 frames_per_buffer=self.frame_length
             )
-            
+
             logging.info("WakeWordDetector: Audio stream opened")
-            
+
             while not self._stop_event.is_set():
                 try:
                     audio_data = stream.read(self.frame_length, exception_on_overflow=False)
-                    
-                    if self._backend_type == "openwakeword":
-                        prediction = self._backend.predict(audio_data)
-                        for model_name, scores in prediction.items():
-                            if any(score > self.config.sensitivity for score in scores):
-                                logging.info(f"Wake word detected: {model_name}")
-                                if self._callback:
-                                    self._callback()
-                                # Brief pause to avoid multiple triggers
-                                time.sleep(1.0)
-                    
-                    elif self._backend_type == "porcupine":
-                        import struct
-                        pcm = struct.unpack_from("h" * self.frame_length, audio_data)
-                        keyword_index = self._backend.process(pcm)
-                        if keyword_index >= 0:
-                            logging.info(f"Wake word detected (index: {keyword_index})")
-                            if self._callback:
-                                self._callback()
-                            time.sleep(1.0)
-                
+                    self._process_frame(audio_data)
                 except Exception as e:
                     logging.error(f"Audio processing error: {e}")
                     time.sleep(0.1)
-            
+
             stream.stop_stream()
             stream.close()
             pa.terminate()
-            
+
         except Exception as e:
             logging.error(f"Wake word detection error: {e}")
     
@@ -619,6 +619,24 @@ def toggle_airplane_mode_advanced(enable: bool = True) -> bool:
 # SHORTCUT FUNCTIONS
 # ========================
 
+# Shared by the create/remove startup paths below
+_STARTUP_FOLDER = os.path.join(
+    os.path.expanduser("~"),
+    "AppData", "Roaming", "Microsoft", "Windows", "Start Menu", "Programs", "Startup"
+)
+_STARTUP_FILE = os.path.join(_STARTUP_FOLDER, "AI_Assistant_Startup.bat")
+
+
+def _write_atomic(path: str, content: str) -> None:
+    """Write a file via temp + os.replace so a crash mid-write never
+    leaves a half-written script behind (a truncated startup .bat would
+    fail on every boot)."""
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(content.encode('utf-8'))
+    os.replace(tmp, path)
+
+
 def create_desktop_shortcut() -> bool:
     """Creates a desktop shortcut to launch the AI assistant"""
     try:
@@ -635,8 +653,7 @@ pause
 '''
         batch_file = os.path.join(desktop, "AI_Assistant.bat")
 
-        with open(batch_file, 'w') as f:
-            f.write(batch_content)
+        _write_atomic(batch_file, batch_content)
 
         print(f"✅ Desktop shortcut created: {batch_file}")
         return True
@@ -654,6 +671,30 @@ def create_advanced_desktop_shortcut() -> bool:
         desktop = os.path.join(os.path.expanduser("~"), "Desktop")
         script_dir = os.path.dirname(os.path.abspath(__file__))
 
+        # Prefer the in-process COM call - same WScript.Shell API the
+        # PowerShell script drives, without spawning a ~400ms PowerShell
+        # process just to create a .lnk
+        try:
+            from win32com.client import Dispatch
+        except ImportError:
+            Dispatch = None
+
+        if Dispatch is not None:
+            try:
+                shell = Dispatch("WScript.Shell")
+                shortcut = shell.CreateShortcut(os.path.join(desktop, "AI Assistant.lnk"))
+                shortcut.TargetPath = "python.exe"
+                shortcut.Arguments = f'"{script_dir}\\assistant.py"'
+                shortcut.WorkingDirectory = script_dir
+                shortcut.Description = "Launch AI Assistant"
+                shortcut.WindowStyle = 1
+                shortcut.Save()
+                print("✅ Advanced desktop shortcut created!")
+                return True
+            except Exception as e:
+                print(f"⚠️ COM method failed: {e}")
+                # Fall through to the PowerShell path
+
         ps_script = f'''
 $WshShell = New-Object -comObject WScript.Shell
 $Shortcut = $WshShell.CreateShortcut("{desktop}\\AI Assistant.lnk")
@@ -665,8 +706,14 @@ $Shortcut.WindowStyle = 1
 $Shortcut.Save()
 '''
 
-        result = subprocess.run(["powershell", "-Command", ps_script],
-                              capture_output=True, text=True)
+        # -NoProfile skips profile-script loading (>100ms of PowerShell
+        # startup); stdout is discarded unread so don't allocate a pipe
+        # for it, but keep stderr for the failure message below.
+        result = subprocess.run(
+            ["powershell", "-NoProfile", "-NonInteractive", "-Command", ps_script],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+            creationflags=subprocess.CREATE_NO_WINDOW
+        )
 
         if result.returncode == 0:
             print("✅ Advanced desktop shortcut created!")
@@ -682,11 +729,6 @@ $Shortcut.Save()
 def create_startup_shortcut() -> bool:
     """Creates a shortcut in Windows startup folder for auto-launch"""
     try:
-        startup_folder = os.path.join(
-            os.path.expanduser("~"),
-            "AppData", "Roaming", "Microsoft", "Windows", "Start Menu", "Programs", "Startup"
-        )
-
         script_dir = os.path.dirname(os.path.abspath(__file__))
 
         batch_content = f'''@echo off
@@ -694,12 +736,9 @@ cd /d "{script_dir}"
 python assistant.py
 '''
 
-        startup_file = os.path.join(startup_folder, "AI_Assistant_Startup.bat")
+        _write_atomic(_STARTUP_FILE, batch_content)
 
-        with open(startup_file, 'w') as f:
-            f.write(batch_content)
-
-        print(f"✅ Startup shortcut created: {startup_file}")
+        print(f"✅ Startup shortcut created: {_STARTUP_FILE}")
         return True
 
     except Exception as e:
@@ -709,15 +748,8 @@ python assistant.py
 def remove_startup_shortcut() -> bool:
     """Removes the startup shortcut"""
     try:
-        startup_folder = os.path.join(
-            os.path.expanduser("~"),
-            "AppData", "Roaming", "Microsoft", "Windows", "Start Menu", "Programs", "Startup"
-        )
-
-        startup_file = os.path.join(startup_folder, "AI_Assistant_Startup.bat")
-
-        if os.path.exists(startup_file):
-            os.remove(startup_file)
+        if os.path.exists(_STARTUP_FILE):
+            os.remove(_STARTUP_FILE)
             print("✅ Startup shortcut removed")
             return True
         else: